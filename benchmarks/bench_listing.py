@@ -0,0 +1,147 @@
+"""Listing parser benchmark: rockquant.sources.listing vs the original full-tree parser.
+
+    python -m benchmarks.bench_listing [saved_page.html ...] [--rows 50] [--repeat 20]
+
+With no pages given, synthetic energy.gov-style listings (page chrome plus
+`--rows` rows) are used, one per pager markup in PAGERS. Both parsers must
+agree on every page's items, and the strained parse must find the same next
+page as next_page_url on the full tree; the lxml backend is timed too when it
+is installed.
+"""
+import argparse
+import json
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+from rockquant.sources.crawl import next_page_url
+from rockquant.sources.listing import HAVE_LXML, parse_listing_html
+from rockquant.sources.registry import all_article_prefixes
+
+LEGACY_DATE_RE = re.compile(
+    r"\b(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},\s+\d{4}\b"
+)
+PAGE_URL = "https://www.energy.gov/lpo/listings/lpo-press-releases"
+# Next-page markups seen on Drupal and federal (USWDS) listing pages.
+PAGERS = {
+    "drupal": ('<nav class="pager"><ul class="pager__items">'
+               '<li class="pager__item pager__item--next"><a href="?page=1" rel="next">Next</a></li>'
+               '</ul></nav>'),
+    "drupal7": '<div class="item-list"><ul><li class="pager-next"><a href="?page=1">next ›</a></li></ul></div>',
+    "rel_next": '<div class="links"><a href="?page=1" rel="next">More</a></div>',
+    "pager_link": '<div class="nav-links"><a class="pager__link pager__link--next" href="?page=1">Next</a></div>',
+    "uswds": ('<nav aria-label="Pagination"><ul class="usa-pagination__list">'
+              '<li class="usa-pagination__item usa-pagination__arrow">'
+              '<a class="usa-pagination__link usa-pagination__next-page" href="?page=1">Next</a>'
+              '</li></ul></nav>'),
+}
+
+
+def legacy_parse(html: str, feed_url: str, article_prefixes: tuple) -> list:
+    """The row loop run_pipeline used before rockquant.sources.listing existed."""
+    soup = BeautifulSoup(html, "html.parser")
+    parsed_feed = urlparse(feed_url)
+    _base = f"{parsed_feed.scheme}://{parsed_feed.netloc}"
+    out = []
+    for row in soup.select("div.views-row"):
+        article_href = None
+        title = None
+        for a in row.find_all("a", href=True):
+            href = a["href"].strip()
+            if href.startswith(article_prefixes):
+                if href.rstrip("/") == "/newsroom/press-releases":
+                    continue
+                article_href = href
+                title = a.get_text(" ", strip=True)
+                break
+        if not article_href:
+            continue
+        article_url = article_href if article_href.startswith("http") else urljoin(_base, article_href)
+        title = (title or "").strip() or article_url
+        date_str = None
+        for s in row.stripped_strings:
+            m = LEGACY_DATE_RE.search(s)
+            if m:
+                date_str = m.group(0)
+                break
+        if not date_str:
+            continue
+        try:
+            event_date = datetime.strptime(date_str, "%B %d, %Y").strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+        out.append((article_url, title, event_date, str(row)))
+    return out
+
+
+def synthetic_page(rows: int, pager: str = "drupal") -> str:
+    chrome = "".join(
+        f'<li class="menu-item"><a href="/topics/{i}">Topic {i}</a><ul>'
+        + "".join(f'<li><a href="/topics/{i}/{j}">Sub {j}</a></li>' for j in range(8))
+        + "</ul></li>"
+        for i in range(40)
+    )
+    body = "".join(
+        f'<div class="views-row"><div class="search-result">'
+        f'<div class="field-image"><img src="/img/{i}.jpg" alt=""></div>'
+        f'<div class="search-result-title"><a href="/lpo/articles/doe-announces-loan-{i}">'
+        f'DOE Announces ${i}.5 Million Loan Guarantee for Project {i}</a></div>'
+        f'<div class="search-result-summary">Summary text for item {i} with more words.</div>'
+        f'<div class="search-result-display-date"><p>March {i % 28 + 1}, 2024</p></div>'
+        f'</div></div>'
+        for i in range(rows)
+    )
+    pager = PAGERS[pager]
+    scripts = "".join(f"<script>var x{i} = {list(range(30))};</script>" for i in range(30))
+    return (f"<html><head><title>LPO</title>{scripts}</head><body>"
+            f"<header><nav><ul>{chrome}</ul></nav></header><main>{body}{pager}</main>"
+            f"<footer><ul>{chrome}</ul></footer></body></html>")
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("pages", nargs="*")
+    ap.add_argument("--rows", type=int, default=50)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    prefixes = all_article_prefixes()
+    pages = [(p, Path(p).read_text(encoding="utf-8", errors="replace")) for p in args.pages] \
+        or [(f"synthetic:{args.rows}:{pager}", synthetic_page(args.rows, pager)) for pager in PAGERS]
+
+    results = []
+    for name, html in pages:
+        page = parse_listing_html(html, PAGE_URL, prefixes)
+        new = [tuple(li) for li in page.items]
+        old = legacy_parse(html, PAGE_URL, prefixes)
+        if new != old:
+            raise SystemExit(f"{name}: parsers disagree ({len(new)} vs {len(old)} items)")
+        full_next = next_page_url(BeautifulSoup(html, "html.parser"), PAGE_URL)
+        if page.next_url != full_next:
+            raise SystemExit(f"{name}: next page {page.next_url!r}, full tree finds {full_next!r}")
+        legacy_s = timed(lambda: legacy_parse(html, PAGE_URL, prefixes), args.repeat)
+        row = {"page": name, "bytes": len(html), "items": len(new), "next_url": page.next_url,
+               "legacy_ms": round(legacy_s * 1000, 3)}
+        for backend in ["html.parser"] + (["lxml"] if HAVE_LXML else []):
+            s = timed(lambda: parse_listing_html(html, PAGE_URL, prefixes, backend=backend), args.repeat)
+            row[f"{backend}_ms"] = round(s * 1000, 3)
+            row[f"{backend}_speedup"] = round(legacy_s / s, 2)
+        results.append(row)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""Local HTTP stand-in for the energy.gov and permitting.gov listing feeds.
+
+    python -m benchmarks.feeds [--port 8808] [--rows 25] [--pages 20] [--latency 0.05]
+
+The server acts as an HTTP proxy: with HTTP_PROXY pointing at it (see
+ListingServer.proxied), the pipeline fetches the real feed URLs over plain
+http and the registry still routes them to the DOE LPO and FAST-41 sources.
+Pages are generated deterministically from (host, path, page, rows, seed);
+each carries a strong ETag, so a repeated crawl sees 304s exactly as in
+production. `latency` is added to every response.
+"""
+import argparse
+import csv
+import io
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from zlib import crc32
+
+from benchmarks.synthetic import title_for
+from rockquant.sources.registry import DOE_LPO, FAST41_COUN
+
+# host -> (source, listing paths, article path prefix)
+LISTINGS = {
+    "www.energy.gov": (DOE_LPO, ("/lpo/listings/edf-news", "/lpo/listings/lpo-press-releases"),
+                       "/lpo/articles/"),
+    "www.permitting.gov": (FAST41_COUN, ("/newsroom/press-releases",), "/newsroom/press-releases/"),
+}
+PROOFCHAIN_PATH = "/proofchain.csv"
+NEWEST = date(2025, 6, 30)
+
+
+def feed_urls() -> list:
+    """The served feeds, as the pipeline addresses them (through the proxy)."""
+    return [f"http://{host}{path}" for host, (_, paths, _) in LISTINGS.items() for path in paths]
+
+
+def _chrome() -> tuple:
+    # Navigation, footer and scripts of a Drupal page, which the parser must skip.
+    nav = "".join(
+        f'<li class="menu-item"><a href="/topics/{i}">Topic {i}</a><ul>'
+        + "".join(f'<li><a href="/topics/{i}/{j}">Sub {j}</a></li>' for j in range(8))
+        + "</ul></li>"
+        for i in range(40)
+    )
+    scripts = "".join(f"<script>var x{i} = {list(range(30))};</script>" for i in range(30))
+    return nav, scripts
+
+
+NAV, SCRIPTS = _chrome()
+
+
+def listing_page(host: str, path: str, page_no: int, rows: int, pages: int, seed: int = 7) -> str:
+    """Page `page_no` of a feed: `rows` rows, newest first, roughly one item per day."""
+    source, _, prefix = LISTINGS[host]
+    rng = random.Random(crc32(f"{seed}|{host}|{path}|{page_no}".encode()))
+    slug = path.strip("/").replace("/", "-")
+    out = []
+    for r in range(rows):
+        i = page_no * rows + r
+        title, _ = title_for(source, i, rng)
+        day = NEWEST - timedelta(days=i)
+        out.append(
+            f'<div class="views-row"><div class="search-result">'
+            f'<div class="field-image"><img src="/img/{i}.jpg" alt=""></div>'
+            f'<div class="search-result-title"><a href="{prefix}{slug}-{i}">{title}</a></div>'
+            f'<div class="search-result-summary">Summary text for item {i} with more words.</div>'
+            f'<div class="search-result-display-date"><p>{day.strftime("%B")} {day.day}, {day.year}</p></div>'
+            f'</div></div>')
+    pager = ""
+    if page_no + 1 < pages:
+        pager = ('<nav class="pager"><ul class="pager__items">'
+                 f'<li class="pager__item pager__item--next"><a href="?page={page_no + 1}" rel="next">Next</a></li>'
+                 '</ul></nav>')
+    return (f"<html><head><title>{slug}</title>{SCRIPTS}</head><body>"
+            f"<header><nav><ul>{NAV}</ul></nav></header><main>{''.join(out)}{pager}</main>"
+            f"<footer><ul>{NAV}</ul></footer></body></html>")
+
+
+def proofchain_csv(rows: int, seed: int = 7) -> str:
+    """A ProofChain-style sheet export for federated search."""
+    rng = random.Random(seed)
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    w.writerow(("headline", "summary", "company_name", "ticker", "source_type", "source_url",
+                "pub_ts", "citation_score"))
+    for i in range(rows):
+        title, _ = title_for(DOE_LPO if i % 3 else FAST41_COUN, i, rng)
+        day = NEWEST - timedelta(days=i % 400)
+        w.writerow((title, f"Summary of item {i}", f"Company {i % 97}", f"T{i % 53}", "press",
+                    f"https://example.test/pc/{i}", f"{day.isoformat()}T12:00:00Z", "0.7"))
+    return buf.getvalue()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        srv = self.server
+        u = urlparse(self.path)  # absolute when proxied, relative when addressed directly
+        host = (u.netloc or self.headers.get("Host", "")).lower()
+        time.sleep(srv.latency_s)
+        with srv.lock:
+            srv.requests += 1
+        if u.path == PROOFCHAIN_PATH:
+            body = proofchain_csv(srv.proofchain_rows, srv.seed).encode()
+            ctype = "text/csv"
+        elif host in LISTINGS and u.path.rstrip("/") in LISTINGS[host][1]:
+            page_no = int(parse_qs(u.query).get("page", ["0"])[0])
+            if page_no >= srv.pages:
+                self._send(404, b"not found", "text/plain")
+                return
+            body = listing_page(host, u.path.rstrip("/"), page_no, srv.rows, srv.pages, srv.seed).encode()
+            ctype = "text/html; charset=utf-8"
+        else:
+            self._send(404, b"not found", "text/plain")
+            return
+        etag = f'"{crc32(body):08x}-{len(body)}"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, b"", None, etag)
+            return
+        self._send(200, body, ctype, etag)
+
+    def _send(self, status: int, body: bytes, ctype: str | None, etag: str | None = None) -> None:
+        self.send_response(status)
+        if ctype:
+            self.send_header("Content-Type", ctype)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with self.server.lock:
+            self.server.bytes_sent += len(body)
+
+
+class ListingServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, rows: int = 25, pages: int = 20, latency_s: float = 0.0,
+                 seed: int = 7, proofchain_rows: int = 2000):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.rows, self.pages, self.latency_s, self.seed = rows, pages, latency_s, seed
+        self.proofchain_rows = proofchain_rows
+        self.lock = threading.Lock()
+        self.requests = self.bytes_sent = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self) -> "ListingServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    @contextmanager
+    def proxied(self):
+        """Route plain-http requests (requests honours HTTP_PROXY) through this server."""
+        saved = {k: os.environ.get(k) for k in ("HTTP_PROXY", "http_proxy", "NO_PROXY", "no_proxy")}
+        os.environ["HTTP_PROXY"] = os.environ["http_proxy"] = self.url
+        os.environ.pop("NO_PROXY", None)
+        os.environ.pop("no_proxy", None)
+        try:
+            yield self
+        finally:
+            for k, v in saved.items():
+                if v is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = v
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Serve synthetic listing feeds (use as HTTP_PROXY)")
+    ap.add_argument("--port", type=int, default=8808)
+    ap.add_argument("--rows", type=int, default=25)
+    ap.add_argument("--pages", type=int, default=20)
+    ap.add_argument("--latency", type=float, default=0.0)
+    args = ap.parse_args()
+    server = ListingServer(args.port, args.rows, args.pages, args.latency)
+    print(f"HTTP_PROXY={server.url}")
+    for url in feed_urls():
+        print(f"  {url}")
+    server.serve_forever()
@@ -0,0 +1,293 @@
+"""End-to-end benchmark suite; results are JSON for comparison between commits.
+
+    python -m benchmarks.suite [--rows 100000] [--repeat 3] [--only pipeline,signals]
+                               [--out results.json] [--compare baseline.json]
+    python -m benchmarks.suite --diff baseline.json results.json
+
+Benchmarks:
+  pipeline  run_pipeline backfill then incremental (all 304s) against the local
+            feed stand-in (benchmarks.feeds), on a fresh database each run
+  classify  DOE LPO and FAST-41 classifiers, batched and one title at a time
+  signals   generate_signals / generate_fast41_signals, full and incremental,
+            on a synthetic events database of --rows rows (benchmarks.synthetic)
+  exports   export_artifacts full (csv, and parquet when pyarrow is installed)
+            and incremental with nothing changed
+  search    federated search.search() over RockQuant FTS and a ProofChain sheet
+            served by the stand-in; cold (snapshot + index build) and warm
+
+Every measurement keeps the best and median of --repeat runs. Results go to
+benchmarks/results/<commit>-<time>.json unless --out is given. --compare
+(or --diff) prints new/old ratios of the median times and exits 1 when any
+benchmark is slower than --tolerance allows.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.feeds import PROOFCHAIN_PATH, ListingServer, feed_urls
+from benchmarks.synthetic import generate_events_db, titles
+from rockquant.qa.exports import HAVE_PYARROW, export_artifacts
+from rockquant.sources.doe_edf.pipeline import run_pipeline
+from rockquant.sources.doe_edf.signals import generate_signals
+from rockquant.sources.fast41.signals import generate_fast41_signals
+from rockquant.sources.registry import DOE_LPO, FAST41_COUN
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+QUERIES = ("loan guarantee", "conditional commitment lithium", "FAST-41 dashboard",
+           "geothermal field", "repays loan early", "transmission line milestone")
+
+
+def measure(fn, repeat: int, items: int | None = None, setup=None) -> dict:
+    """Best and median wall time of `repeat` calls of fn() (setup() runs untimed first)."""
+    runs = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - t0)
+    out = {"best_s": round(min(runs), 6), "median_s": round(statistics.median(runs), 6), "runs": len(runs)}
+    if items:
+        out["items"] = items
+        out["per_item_us"] = round(statistics.median(runs) / items * 1e6, 3)
+    return out
+
+
+@contextlib.contextmanager
+def quiet():
+    # run_pipeline and fetch_articles report progress on stdout
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def _fresh(path: Path) -> None:
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(f"{path}{suffix}"):
+            os.remove(f"{path}{suffix}")
+
+
+def bench_pipeline(ctx: dict) -> dict:
+    server, tmp, repeat = ctx["server"], ctx["tmp"], ctx["repeat"]
+    db = tmp / "pipeline.db"
+    config = {"feeds": feed_urls(), "rate_limit_s": 0, "max_pages": 0}
+    last = {}
+
+    def backfill():
+        with quiet():
+            last["backfill"] = run_pipeline(str(db), {**config, "crawl_mode": "backfill"})
+
+    def incremental():
+        with quiet():
+            last["incremental"] = run_pipeline(str(db), {**config, "crawl_mode": "incremental"})
+
+    with server.proxied():
+        out = {"pipeline_backfill": measure(backfill, repeat, setup=lambda: _fresh(db))}
+        out["pipeline_backfill"]["items"] = last["backfill"]["events"]
+        out["pipeline_backfill"]["stages_s"] = last["backfill"]["timings"]
+        out["pipeline_incremental"] = measure(incremental, repeat)
+        out["pipeline_incremental"]["stages_s"] = last["incremental"]["timings"]
+    errors = last["backfill"]["feed_errors"] + last["incremental"]["feed_errors"]
+    if errors:
+        raise RuntimeError(f"pipeline benchmark hit feed errors: {errors[:3]}")
+    return out
+
+
+def bench_classify(ctx: dict) -> dict:
+    n = min(ctx["rows"], 50000)
+    by_source = {DOE_LPO.entity_id: [], FAST41_COUN.entity_id: []}
+    for source, title in titles(n, seed=11):
+        by_source[source.entity_id].append(title)
+    out = {}
+    for source in (DOE_LPO, FAST41_COUN):
+        ts = by_source[source.entity_id]
+        name = source.entity_id.lower()
+        out[f"classify_{name}_batch"] = measure(lambda: source.classify_titles(ts), ctx["repeat"], len(ts))
+        out[f"classify_{name}_single"] = measure(lambda: [source.classify(t) for t in ts], ctx["repeat"], len(ts))
+    return out
+
+
+def bench_signals(ctx: dict) -> dict:
+    db, repeat = str(ctx["db"]), ctx["repeat"]
+    conn = sqlite3.connect(db)
+    try:
+        recent = [r[0] for r in conn.execute(
+            "SELECT DISTINCT event_date FROM events ORDER BY event_date DESC LIMIT 30")]
+    finally:
+        conn.close()
+    out = {
+        "generate_signals_full": measure(lambda: generate_signals(db), repeat, ctx["events"]),
+        "generate_fast41_signals_full": measure(lambda: generate_fast41_signals(db), repeat, ctx["events"]),
+    }
+    dirty = {(d, DOE_LPO.entity_id) for d in recent}
+    out["generate_signals_30_days"] = measure(lambda: generate_signals(db, dirty=dirty), repeat)
+    dirty = {(d, FAST41_COUN.entity_id) for d in recent}
+    out["generate_fast41_signals_30_days"] = measure(lambda: generate_fast41_signals(db, dirty=dirty), repeat)
+    return out
+
+
+def bench_exports(ctx: dict) -> dict:
+    db, tmp, repeat = str(ctx["db"]), ctx["tmp"], ctx["repeat"]
+    out_dir = tmp / "exports"
+    clear = lambda: shutil.rmtree(out_dir, ignore_errors=True)  # noqa: E731
+    out = {"export_csv_full": measure(lambda: export_artifacts(db, str(out_dir), formats=("csv",)),
+                                      repeat, ctx["events"], setup=clear)}
+    out["export_csv_incremental"] = measure(lambda: export_artifacts(db, str(out_dir), formats=("csv",)), repeat)
+    if HAVE_PYARROW:
+        out["export_parquet_full"] = measure(lambda: export_artifacts(db, str(out_dir), formats=("parquet",)),
+                                             repeat, ctx["events"], setup=clear)
+    return out
+
+
+def bench_search(ctx: dict) -> dict:
+    tmp, server = ctx["tmp"], ctx["server"]
+    config = json.loads((ROOT / "federated" / "config.json").read_text())
+    for src in config["sources"].values():
+        src["enabled"] = False
+    config["sources"]["ProofChain"].update(enabled=True, sheet_csv_url=server.url + PROOFCHAIN_PATH)
+    config["sources"]["RockQuant"].update(enabled=True, db_path=str(ctx["db"]))
+    config["snapshot_dir"] = str(tmp / "snapshots")
+    cfg_path = tmp / "federated.json"
+    cfg_path.write_text(json.dumps(config))
+    # federated/ is a script directory; search.py reads its config at import
+    os.environ["FEDERATED_CONFIG"] = str(cfg_path)
+    sys.path.insert(0, str(ROOT / "federated"))
+    try:
+        import search
+    finally:
+        sys.path.pop(0)
+    t0 = time.perf_counter()
+    search.search(QUERIES[0])
+    out = {"search_cold": {"best_s": round(time.perf_counter() - t0, 6), "runs": 1}}
+    out["search_warm"] = measure(lambda: [search.search(q) for q in QUERIES], ctx["repeat"], len(QUERIES))
+    return out
+
+
+BENCHES = {
+    "pipeline": bench_pipeline,
+    "classify": bench_classify,
+    "signals": bench_signals,
+    "exports": bench_exports,
+    "search": bench_search,
+}
+
+
+def _git(*args) -> str | None:
+    try:
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(rows: int = 100000, repeat: int = 3, only: tuple | None = None, db: str | None = None,
+              feed_rows: int = 25, feed_pages: int = 20, latency_s: float = 0.0, seed: int = 7) -> dict:
+    names = [n for n in BENCHES if not only or n in only]
+    result = {
+        "meta": {
+            "commit": _git("rev-parse", "HEAD"),
+            "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "sqlite": sqlite3.sqlite_version,
+            "pyarrow": HAVE_PYARROW,
+            "params": {"rows": rows, "repeat": repeat, "feed_rows": feed_rows, "feed_pages": feed_pages,
+                       "latency_s": latency_s, "seed": seed},
+        },
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        ctx = {"tmp": tmp, "rows": rows, "repeat": repeat}
+        if {"signals", "exports", "search"} & set(names):
+            path = Path(db) if db else tmp / "events.db"
+            if not path.exists():
+                result["meta"]["generate_db"] = generate_events_db(str(path), rows, seed=seed)
+            ctx["db"] = path
+            conn = sqlite3.connect(path)
+            ctx["events"] = conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+            conn.close()
+            result["meta"]["db_events"] = ctx["events"]
+        server = ListingServer(rows=feed_rows, pages=feed_pages, latency_s=latency_s, seed=seed).start()
+        ctx["server"] = server
+        try:
+            for name in names:
+                print(f"[bench] {name}", file=sys.stderr, flush=True)
+                result["results"].update(BENCHES[name](ctx))
+        finally:
+            server.stop()
+    return result
+
+
+def compare(baseline: dict, current: dict, tolerance: float = 0.2) -> list:
+    """[(name, old_s, new_s, ratio, regressed)] over benchmarks present in both runs."""
+    rows = []
+    for name, new in current["results"].items():
+        old = baseline["results"].get(name)
+        if not old:
+            continue
+        old_s, new_s = old.get("median_s", old["best_s"]), new.get("median_s", new["best_s"])
+        ratio = new_s / old_s if old_s else float("inf")
+        rows.append((name, old_s, new_s, round(ratio, 3), ratio > 1 + tolerance))
+    return rows
+
+
+def print_comparison(rows: list, baseline: dict, current: dict) -> None:
+    print(f"baseline {str(baseline['meta'].get('commit'))[:10]}  ->  "
+          f"current {str(current['meta'].get('commit'))[:10]}")
+    for name, old_s, new_s, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"  {name:36s} {old_s * 1000:10.2f} ms -> {new_s * 1000:10.2f} ms  x{ratio:<6}{flag}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="RockQuant benchmark suite")
+    ap.add_argument("--rows", type=int, default=100000, help="synthetic events (10^4 .. 10^7)")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--only", help=f"comma-separated subset of {','.join(BENCHES)}")
+    ap.add_argument("--db", help="reuse (or create) this synthetic events database")
+    ap.add_argument("--feed-rows", type=int, default=25, help="rows per listing page")
+    ap.add_argument("--feed-pages", type=int, default=20, help="pages per feed")
+    ap.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--out", help="results file (default: benchmarks/results/<commit>-<time>.json)")
+    ap.add_argument("--compare", help="baseline results file to compare against")
+    ap.add_argument("--diff", nargs=2, metavar=("BASELINE", "CURRENT"), help="compare two results files")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before failing")
+    args = ap.parse_args()
+
+    if args.diff:
+        baseline, current = (json.loads(Path(p).read_text()) for p in args.diff)
+    else:
+        current = run_suite(args.rows, args.repeat, tuple(args.only.split(",")) if args.only else None,
+                            args.db, args.feed_rows, args.feed_pages, args.latency, args.seed)
+        out = Path(args.out) if args.out else RESULTS_DIR / (
+            f"{(current['meta']['commit'] or 'nogit')[:10]}-{datetime.now():%Y%m%dT%H%M%S}.json")
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(current, indent=2))
+        print(json.dumps(current["results"], indent=2))
+        print(f"results written to {out}", file=sys.stderr)
+        if not args.compare:
+            return
+        baseline = json.loads(Path(args.compare).read_text())
+    rows = compare(baseline, current, args.tolerance)
+    print_comparison(rows, baseline, current)
+    sys.exit(1 if any(r[4] for r in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Synthetic titles and `events` databases for the benchmarks.
+
+    python -m benchmarks.synthetic out.db [--rows 1000000] [--seed 7]
+
+Titles come from per-source templates that cover most classifier subtypes.
+Each template is classified once with the real classifier and that subtype is
+reused, so generating 10^7 rows does not cost 10^7 classifier calls. Rows go
+straight into source_documents and events (the FTS triggers index them), in
+batches of `batch` rows per transaction.
+"""
+import argparse
+import json
+import random
+import time
+from datetime import date, timedelta
+
+from rockquant.db.connection import connect
+from rockquant.db.migrate import migrate
+from rockquant.sources.registry import DOE_LPO, FAST41_COUN
+
+COMPANIES = ("Rhyolite Ridge", "Thacker Pass", "Palisades", "Vogtle", "Plug Power", "Redwood Materials",
+             "Li-Cycle", "Sunnova", "Holtec", "Fervo Energy", "Monolith", "Ascend Elements",
+             "Blue Oval SK", "StarPlus Energy", "Grain Belt Express", "Lithium Americas")
+PROJECTS = ("lithium mine", "battery plant", "geothermal field", "nuclear restart", "transmission line",
+            "solar farm", "hydrogen hub", "copper smelter", "wind project", "pumped storage project")
+# source entity id -> templates; {co}, {proj}, {n} are filled in per title
+TEMPLATES = {
+    DOE_LPO.entity_id: (
+        "DOE Closes ${n} Million Loan Guarantee to {co} for {proj}",
+        "LPO Finalizes ${n} Million Loan to {co}",
+        "DOE Announces Conditional Commitment to {co} for {proj}",
+        "LPO Offers Conditional Commitment for {co} {proj}",
+        "DOE Approves Loan Disbursement to {co}",
+        "{co} Repays ${n} Million DOE Loan Early",
+        "DOE Terminates Conditional Commitment for {co}",
+        "LPO Restructures Loan for {co} {proj}",
+        "DOE Announces ${n} Million for {proj} Projects",
+        "LPO Issues Solicitation for {proj} Applications",
+        "LPO Releases Year in Review Report",
+        "Secretary Applauds Decision on {co} {proj}",
+        "{co} Breaks Ground on {proj}",
+    ),
+    FAST41_COUN.entity_id: (
+        "{co} {proj} Added to FAST-41 Permitting Dashboard",
+        "{co} {proj} Latest to Gain FAST-41 Coverage",
+        "Permitting Council Marks Milestone for {co} {proj}",
+        "Significant Progress Achieved on {co} {proj}",
+        "{co} {proj} Completes Federal Permitting Approval",
+        "Executive Director Tours {co} {proj}",
+        "Permitting Council Releases Quarterly Update",
+    ),
+}
+
+
+def title_for(source, i: int, rng: random.Random) -> tuple:
+    """(title, template index) of the i-th synthetic title of `source`."""
+    templates = TEMPLATES[source.entity_id]
+    t = rng.randrange(len(templates))
+    title = templates[t].format(co=rng.choice(COMPANIES), proj=rng.choice(PROJECTS), n=rng.randrange(10, 9000))
+    return f"{title} ({i})", t
+
+
+def titles(n: int, seed: int = 7) -> list:
+    """[(source, title)] alternating DOE LPO and FAST-41 two to one."""
+    rng = random.Random(seed)
+    out = []
+    for i in range(n):
+        source = FAST41_COUN if i % 3 == 0 else DOE_LPO
+        out.append((source, title_for(source, i, rng)[0]))
+    return out
+
+
+def template_subtypes() -> dict:
+    """{(source entity, template index): subtype} from the real classifiers."""
+    out = {}
+    for source in (DOE_LPO, FAST41_COUN):
+        templates = TEMPLATES[source.entity_id]
+        rng = random.Random(0)
+        subtypes = source.classify_titles(
+            [tpl.format(co=rng.choice(COMPANIES), proj=rng.choice(PROJECTS), n=100) for tpl in templates])
+        out.update({(source.entity_id, t): s for t, s in enumerate(subtypes)})
+    return out
+
+
+def _rows(rows: int, seed: int, start: date, days: int):
+    rng = random.Random(seed)
+    subtypes = template_subtypes()
+    for i in range(rows):
+        source = FAST41_COUN if i % 3 == 0 else DOE_LPO
+        title, t = title_for(source, i, rng)
+        day = (start + timedelta(days=rng.randrange(days))).isoformat()
+        host = "www.permitting.gov/newsroom/press-releases" if source is FAST41_COUN else "www.energy.gov/lpo/articles"
+        yield (f"syn-{seed}-{i}", day, title, f"https://{host}/syn-{i}",
+               subtypes[(source.entity_id, t)], source.entity_id)
+
+
+def generate_events_db(db_path: str, rows: int, seed: int = 7, start: str = "2015-01-01",
+                       days: int = 3650, batch: int = 50000) -> dict:
+    """Append `rows` synthetic events (and their source documents) to `db_path`."""
+    migrate(db_path)
+    conn = connect(db_path)
+    t0 = time.perf_counter()
+    try:
+        conn.execute("PRAGMA synchronous = OFF")  # a throwaway fixture, not production data
+        it = _rows(rows, seed, date.fromisoformat(start), days)
+        while True:
+            chunk = [r for _, r in zip(range(batch), it)]
+            if not chunk:
+                break
+            base = conn.execute("SELECT COALESCE(MAX(id), 0) FROM source_documents").fetchone()[0]
+            conn.executemany("INSERT INTO source_documents (id, url, published_date) VALUES (?, ?, ?)",
+                             [(base + k + 1, r[3], r[1]) for k, r in enumerate(chunk)])
+            conn.executemany("""
+                INSERT INTO events (canonical_event_key, event_date, title, url, event_subtype,
+                                    source_entity_id, source_doc_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, [(*r, base + k + 1) for k, r in enumerate(chunk)])
+            conn.commit()
+        total = conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+    finally:
+        conn.close()
+    return {"db_path": db_path, "rows": rows, "events": total, "seed": seed,
+            "seconds": round(time.perf_counter() - t0, 3)}
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Generate a synthetic events database")
+    ap.add_argument("db_path")
+    ap.add_argument("--rows", type=int, default=100000)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--batch", type=int, default=50000)
+    args = ap.parse_args()
+    print(json.dumps(generate_events_db(args.db_path, args.rows, seed=args.seed, batch=args.batch), indent=2))
@@ -0,0 +1,112 @@
+"""Local snapshots of remote sources and an in-memory token index over them."""
+import csv, hashlib, io, json, os, re, threading, time
+import xml.etree.ElementTree as ET
+import requests
+
+TOKEN_RE = re.compile(r"\w+")
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+def tokens(text):
+    return TOKEN_RE.findall((text or "").lower())
+
+class SnapshotStore:
+    """One file per source under `root`, refreshed by TTL and HTTP validators.
+
+    A snapshot younger than ttl_s is served without touching the network; an
+    older one is revalidated with If-None-Match/If-Modified-Since. If the
+    refresh fails, the stale copy is served and the status says so. Refreshes
+    of one source are serialized; temp files are per process and thread, so
+    processes sharing `root` do not collide either.
+    """
+    def __init__(self, root, session=None):
+        self.root=root; self.session=session or requests.Session()
+        self._locks={}; self._locks_lock=threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def lock(self, name):
+        """Reentrant per-source lock; hold it to keep a snapshot and what is built from it in step."""
+        with self._locks_lock:
+            return self._locks.setdefault(name, threading.RLock())
+
+    def _paths(self, name):
+        safe=re.sub(r"[^\w.-]","_",name)
+        return os.path.join(self.root,safe+".body"), os.path.join(self.root,safe+".meta.json")
+
+    def get(self, name, url, ttl_s=300, timeout=15, headers=None):
+        """-> (text, meta, status) with status in fresh|revalidated|refreshed|stale."""
+        with self.lock(name):
+            return self._get(name, url, ttl_s, timeout, headers)
+
+    def _get(self, name, url, ttl_s, timeout, headers):
+        body_p, meta_p = self._paths(name)
+        meta={}
+        if os.path.exists(meta_p) and os.path.exists(body_p):
+            with open(meta_p) as f: meta=json.load(f)
+        if meta and time.time()-meta.get("checked_at",0) < ttl_s:
+            return self._read(body_p), meta, "fresh"
+        h=dict(headers or {})
+        if meta.get("etag"): h["If-None-Match"]=meta["etag"]
+        if meta.get("last_modified"): h["If-Modified-Since"]=meta["last_modified"]
+        try:
+            r=self.session.get(url, headers=h, timeout=timeout)
+            if r.status_code==304 and meta:
+                meta["checked_at"]=time.time(); self._write_meta(meta_p, meta)
+                return self._read(body_p), meta, "revalidated"
+            r.raise_for_status()
+        except Exception:
+            if meta: return self._read(body_p), meta, "stale"
+            raise
+        text=r.text
+        meta={"url":url,"etag":r.headers.get("ETag"),"last_modified":r.headers.get("Last-Modified"),
+              "sha256":hashlib.sha256(text.encode("utf-8")).hexdigest(),
+              "fetched_at":time.time(),"checked_at":time.time()}
+        tmp=self._tmp(body_p)
+        with open(tmp,"w",encoding="utf-8") as f: f.write(text)
+        os.replace(tmp, body_p)
+        self._write_meta(meta_p, meta)
+        return text, meta, "refreshed"
+
+    def _read(self, p):
+        with open(p, encoding="utf-8") as f: return f.read()
+
+    def _tmp(self, p):
+        return f"{p}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    def _write_meta(self, p, meta):
+        tmp=self._tmp(p)
+        with open(tmp,"w") as f: json.dump(meta,f)
+        os.replace(tmp,p)
+
+def parse_csv(text):
+    """Stream rows of a CSV export as dicts (handles quoted commas/newlines)."""
+    for row in csv.DictReader(io.StringIO(text)):
+        yield {(k or "").strip(): (v or "").strip() for k,v in row.items()}
+
+def parse_atom(text):
+    """Stream {title, link, updated, summary} entries from an Atom feed."""
+    for _,el in ET.iterparse(io.BytesIO(text.encode("utf-8")), events=("end",)):
+        if el.tag!=ATOM+"entry": continue
+        link=el.find(ATOM+"link")
+        yield {"title":(el.findtext(ATOM+"title") or "").strip(),
+               "link":link.get("href","") if link is not None else "",
+               "updated":(el.findtext(ATOM+"updated") or "").strip(),
+               "summary":(el.findtext(ATOM+"summary") or "").strip()}
+        el.clear()
+
+class TokenIndex:
+    """Inverted index: token -> set of record ids; lookups AND the query tokens."""
+    def __init__(self, records, fields):
+        self.records=list(records); self.blobs=[]; self.postings={}
+        for i,rec in enumerate(self.records):
+            blob=" ".join(rec.get(f,"") for f in fields).lower()
+            self.blobs.append(blob)
+            for t in set(tokens(blob)): self.postings.setdefault(t,set()).add(i)
+
+    def search(self, q):
+        """-> [(record, phrase_match)] for records containing every query token."""
+        qt=tokens(q)
+        if not qt: return []
+        sets=sorted((self.postings.get(t,set()) for t in set(qt)), key=len)
+        hits=set.intersection(*sets) if sets[0] else set()
+        ql=q.lower().strip()
+        return [(self.records[i], ql in self.blobs[i]) for i in sorted(hits)]
@@ -1,66 +1,159 @@
-import json, datetime as dt, requests
+import json, os, sqlite3, threading, time, datetime as dt
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from index import SnapshotStore, TokenIndex, parse_atom, parse_csv, tokens
 
-CFG = json.load(open("config.json"))
+CFG = json.load(open(os.environ.get("FEDERATED_CONFIG","config.json")))
 
 def _recency(pub_ts):
     try: t = dt.datetime.fromisoformat(pub_ts.replace("Z","+00:00"))
     except Exception: return 0
-    days = max(0.0, (dt.datetime.utcnow() - t).total_seconds()/86400.0)
+    if t.tzinfo is None: t = t.replace(tzinfo=dt.timezone.utc)
+    days = max(0.0, (dt.datetime.now(dt.timezone.utc) - t).total_seconds()/86400.0)
     tau = CFG.get("time_window_days", 60)
     return max(0.0, 1.0 - min(1.0, days/tau))
 
+RANK = {"relevance":0.5,"recency":0.3,"citation":0.2, **CFG.get("ranking",{})}
+
 def _score(x):
-    return 0.5*x.get("relevance",0) + 0.3*x.get("recency",0) + 0.2*x.get("citation",0)
+    return sum(w*x.get(k,0) for k,w in RANK.items())
+
+# Remote data is held in local snapshots (refreshed by TTL / validators) and
+# queried through a token index that is rebuilt only when a snapshot changes.
+STORE = SnapshotStore(CFG.get("snapshot_dir", ".snapshots"))
+_INDEXES = {}; SNAPSHOT_STATUS = {}
+SEC_URL = "https://www.sec.gov/cgi-bin/browse-edgar?action=getcurrent&type=&company=&dateb=&owner=exclude&start=0&count=100&output=atom"
 
-def fetch_proofchain(q):
+def _index(name, url, parse, fields, timeout, headers=None):
+    # Concurrent queries of one source wait for a single refresh and rebuild.
+    with STORE.lock(name):
+        src=CFG["sources"].get(name,{})
+        text,meta,st=STORE.get(name, url, ttl_s=float(src.get("snapshot_ttl_s", CFG.get("snapshot_ttl_s",300))),
+                               timeout=timeout, headers=headers)
+        SNAPSHOT_STATUS[name]=st
+        cached=_INDEXES.get(name)
+        if cached is None or cached[0]!=meta["sha256"]:
+            cached=_INDEXES[name]=(meta["sha256"], TokenIndex(parse(text), fields))
+        return cached[1]
+
+# Fetchers raise on failure; search_detailed() turns that into per-source status.
+def fetch_proofchain(q, timeout=15):
     out=[]; src=CFG["sources"].get("ProofChain",{})
     if not src.get("enabled"): return out
-    url = src.get("sheet_csv_url"); 
+    url = src.get("sheet_csv_url")
     if not url: return out
-    try:
-        text = requests.get(url, timeout=15).text
-        lines = text.splitlines(); headers = [h.strip() for h in lines[0].split(",")]
-        for line in lines[1:]:
-            vals = [v.strip() for v in line.split(",")]
-            row = dict(zip(headers, vals))
-            blob = " ".join([row.get("headline",""),row.get("summary",""),row.get("company_name",""),row.get("ticker","")])
-            if q.lower() in blob.lower():
-                item = {
-                    "source":"ProofChain","source_type":row.get("source_type",""),
-                    "headline":row.get("headline",""),"summary":row.get("summary",""),
-                    "url":row.get("source_url",""),"pub_ts":row.get("pub_ts",""),
-                    "relevance":1.0,"recency":_recency(row.get("pub_ts","")),
-                    "citation": float(row.get("citation_score") or 0.6)
-                }
-                item["final_score"]=_score(item); out.append(item)
-    except Exception: pass
+    idx=_index("ProofChain", url, parse_csv, ("headline","summary","company_name","ticker"), timeout)
+    for row,phrase in idx.search(q):
+        item = {
+            "source":"ProofChain","source_type":row.get("source_type",""),
+            "headline":row.get("headline",""),"summary":row.get("summary",""),
+            "url":row.get("source_url",""),"pub_ts":row.get("pub_ts",""),
+            "relevance":1.0 if phrase else 0.8,"recency":_recency(row.get("pub_ts","")),
+            "citation": float(row.get("citation_score") or 0.6)
+        }
+        item["final_score"]=_score(item); out.append(item)
     return out
 
-def fetch_sec(q):
+def fetch_sec(q, timeout=15):
     if not CFG["sources"]["SEC"]["enabled"]: return []
-    url="https://www.sec.gov/cgi-bin/browse-edgar?action=getcurrent&type=&company=&dateb=&owner=exclude&start=0&count=100&output=atom"
     out=[]
-    try:
-        txt=requests.get(url, headers={"User-Agent":"BullyWiz/1.0"}, timeout=15).text
-        for entry in txt.split("<entry>")[1:]:
-            title=entry.split("<title>")[1].split("</title>")[0]
-            link=entry.split('link href="')[1].split('"')[0] if 'link href="' in entry else ""
-            if q.lower() in title.lower():
-                it={"source":"SEC","source_type":"EDGAR","headline":title,"summary":"EDGAR current filing",
-                    "url":link,"pub_ts":dt.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
-                    "relevance":0.9,"recency":1.0,"citation":1.0}
-                it["final_score"]=_score(it); out.append(it)
-    except Exception: pass
+    idx=_index("SEC", SEC_URL, parse_atom, ("title",), timeout, headers={"User-Agent":"BullyWiz/1.0"})
+    for e,phrase in idx.search(q):
+        pub=e["updated"] or dt.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+        it={"source":"SEC","source_type":"EDGAR","headline":e["title"],"summary":"EDGAR current filing",
+            "url":e["link"],"pub_ts":pub,
+            "relevance":0.9 if phrase else 0.72,"recency":_recency(pub),"citation":1.0}
+        it["final_score"]=_score(it); out.append(it)
     return out
 
-def search(query):
+# Local RockQuant events through the events_fts index (migration 008). Fetchers
+# run on a fresh executor per query, so read-only connections are pooled rather
+# than kept per thread; at most DB_POOL_IDLE stay open between queries.
+_DB_POOL = {}; _DB_LOCK = threading.Lock(); DB_POOL_IDLE = 8
+
+@contextmanager
+def _rockquant_db(path):
+    with _DB_LOCK:
+        idle=_DB_POOL.setdefault(path,[])
+        conn=idle.pop() if idle else None
+    if conn is None:
+        conn=sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+    try: yield conn
+    finally:
+        with _DB_LOCK:
+            if len(_DB_POOL[path])<DB_POOL_IDLE: _DB_POOL[path].append(conn); conn=None
+        if conn is not None: conn.close()
+
+def fetch_rockquant(q, timeout=15):
+    src=CFG["sources"].get("RockQuant",{})
+    if not src.get("enabled"): return []
+    qt=tokens(q)
+    if not qt: return []
+    # Titles weigh 10x article bodies; bm25() is negative, lower is better.
+    with _rockquant_db(src.get("db_path","rockquant.db")) as conn:
+        rows=conn.execute("""
+            SELECT e.title, e.url, e.event_date, e.event_subtype, bm25(events_fts, 10.0, 1.0) AS rank,
+                   snippet(events_fts, 1, '', '', ' ... ', 24)
+            FROM events_fts JOIN events e ON e.id = events_fts.rowid
+            WHERE events_fts MATCH ? ORDER BY rank LIMIT ?""",
+            (" ".join('"%s"' % t for t in qt), int(src.get("limit",50)))).fetchall()
+    out=[]; best=rows[0][4] if rows else -1.0
+    for title,url,date,subtype,rank,snip in rows:
+        it={"source":"RockQuant","source_type":subtype or "","headline":title,"summary":snip or "",
+            "url":url or "","pub_ts":date,"relevance":rank/best if best<0 else 1.0,
+            "recency":_recency(date),"citation":float(src.get("citation",0.9))}
+        it["final_score"]=_score(it); out.append(it)
+    return out
+
+# Source name (as in config.json) -> fetcher(query, timeout). Enabled sources
+# without an adapter are reported as "no_adapter".
+FETCHERS = {"ProofChain": fetch_proofchain, "SEC": fetch_sec, "RockQuant": fetch_rockquant}
+
+def _run_source(name, fn, q, timeout):
+    t0=time.monotonic()
+    try: r={"status":"ok","results":fn(q, timeout=timeout)}
+    except Exception as e: r={"status":"error","error":f"{type(e).__name__}: {e}","results":[]}
+    r["latency_ms"]=round((time.monotonic()-t0)*1000,1)
+    if name in SNAPSHOT_STATUS: r["snapshot"]=SNAPSHOT_STATUS[name]
+    return r
+
+def search_detailed(query, deadline_s=None, limit=25):
+    """Query every enabled source concurrently; partial results plus per-source status.
+
+    Each source gets sources.<name>.timeout_s (default 15 s), clipped to the overall
+    query deadline (deadline_s or config "query_deadline_s", default 20 s). Sources
+    still running at the deadline are reported as "timeout" and left behind.
+    """
+    deadline_s=float(deadline_s if deadline_s is not None else CFG.get("query_deadline_s",20))
+    start=time.monotonic(); status=dict.fromkeys(CFG["sources"]); jobs={}
+    ex=ThreadPoolExecutor(max_workers=max(1,len(FETCHERS)))
+    try:
+        for name,src in CFG["sources"].items():
+            if not src.get("enabled"): status[name]={"status":"disabled"}; continue
+            fn=FETCHERS.get(name)
+            if fn is None: status[name]={"status":"no_adapter"}; continue
+            timeout=min(float(src.get("timeout_s",15)), deadline_s)
+            jobs[ex.submit(_run_source, name, fn, query, timeout)]=name
+        done,_=wait(jobs, timeout=deadline_s)
+    finally:
+        ex.shutdown(wait=False, cancel_futures=True)
     pool=[]
-    pool+=fetch_proofchain(query)
-    pool+=fetch_sec(query)
+    for fut,name in jobs.items():
+        if fut in done:
+            r=fut.result(); res=r.pop("results"); pool+=res
+            status[name]={**r,"count":len(res)}
+        else:
+            status[name]={"status":"timeout","latency_ms":round((time.monotonic()-start)*1000,1)}
     pool.sort(key=lambda r:r["final_score"], reverse=True)
-    return pool[:25]
+    return {"query":query,"results":pool[:limit],"sources":status,
+            "latency_ms":round((time.monotonic()-start)*1000,1),
+            "partial":any(v["status"] in ("error","timeout") for v in status.values())}
+
+def search(query):
+    return search_detailed(query)["results"]
 
 if __name__=="__main__":
     import sys
-    q=" ".join(sys.argv[1:]) or "fluorspar Utah permit"
-    print(json.dumps(search(q), indent=2))
+    args=sys.argv[1:]; detailed="--status" in args; args=[a for a in args if a!="--status"]
+    q=" ".join(args) or "fluorspar Utah permit"
+    print(json.dumps(search_detailed(q) if detailed else search(q), indent=2))
@@ -0,0 +1,108 @@
+"""Resident federated search: keeps snapshots, indexes and HTTP pools warm.
+
+    python service.py [--host 127.0.0.1 --port 8765 | --unix /tmp/fsearch.sock]
+
+GET  /search?q=...&limit=25     -> search_detailed() result
+POST /batch {"queries":[...], "limit":25}  -> {"results":[...], "latency_ms"}
+GET  /health                    -> cache and snapshot state
+Repeated queries (normalized: lower-cased tokens) are answered from an LRU
+cache for service.cache_ttl_s; partial answers are not cached.
+"""
+import argparse, json, os, socketserver, threading, time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import search
+from index import tokens
+
+SVC = {"cache_size":512, "cache_ttl_s":60, "batch_workers":4, "max_batch":100, **search.CFG.get("service",{})}
+
+def normalize(q):
+    return " ".join(tokens(q))
+
+class ResultCache:
+    """Bounded LRU of query -> (expires_at, value)."""
+    def __init__(self, size, ttl_s):
+        self.size=size; self.ttl_s=ttl_s; self.lock=threading.Lock()
+        self.items=OrderedDict(); self.hits=self.misses=0
+
+    def get(self, key):
+        with self.lock:
+            hit=self.items.get(key)
+            if hit is None or hit[0]<time.monotonic():
+                if hit is not None: del self.items[key]
+                self.misses+=1; return None
+            self.items.move_to_end(key); self.hits+=1
+            return hit[1]
+
+    def put(self, key, value):
+        with self.lock:
+            self.items[key]=(time.monotonic()+self.ttl_s, value); self.items.move_to_end(key)
+            while len(self.items)>self.size: self.items.popitem(last=False)
+
+CACHE = ResultCache(int(SVC["cache_size"]), float(SVC["cache_ttl_s"]))
+BATCH = ThreadPoolExecutor(max_workers=int(SVC["batch_workers"]))
+
+def cached_search(q, limit=25):
+    key=(normalize(q), limit)
+    hit=CACHE.get(key)
+    if hit is not None: return {**hit,"query":q,"cached":True}
+    # The normalized text is only the cache key; phrase matching needs the query as typed.
+    r=search.search_detailed(q, limit=limit)
+    if not r["partial"]: CACHE.put(key, r)
+    return {**r,"query":q,"cached":False}
+
+def batch_search(queries, limit=25):
+    # Queries that normalize to the same text run once, as the first of them was typed.
+    uniq={}
+    for q in queries: uniq.setdefault(normalize(q), q)
+    done=dict(zip(uniq, BATCH.map(lambda q: cached_search(q, limit), uniq.values())))
+    return [{**done[normalize(q)],"query":q} for q in queries]
+
+class Handler(BaseHTTPRequestHandler):
+    def _send(self, code, body):
+        data=json.dumps(body).encode()
+        self.send_response(code); self.send_header("Content-Type","application/json")
+        self.send_header("Content-Length",str(len(data))); self.end_headers(); self.wfile.write(data)
+
+    def do_GET(self):
+        u=urlparse(self.path); qs=parse_qs(u.query)
+        if u.path=="/health":
+            return self._send(200,{"cache_entries":len(CACHE.items),"cache_hits":CACHE.hits,
+                                   "cache_misses":CACHE.misses,"snapshots":search.SNAPSHOT_STATUS})
+        if u.path!="/search" or not qs.get("q"): return self._send(404,{"error":"GET /search?q=..."})
+        self._send(200, cached_search(qs["q"][0], int(qs.get("limit",[25])[0])))
+
+    def do_POST(self):
+        if urlparse(self.path).path!="/batch": return self._send(404,{"error":"POST /batch"})
+        try:
+            body=json.loads(self.rfile.read(int(self.headers.get("Content-Length",0))) or b"{}")
+            queries=[str(q) for q in body["queries"]]
+        except (ValueError, KeyError, TypeError) as e:
+            return self._send(400,{"error":f"bad request: {e}"})
+        if len(queries)>int(SVC["max_batch"]): return self._send(413,{"error":"too many queries"})
+        t0=time.monotonic(); res=batch_search(queries, int(body.get("limit",25)))
+        self._send(200,{"results":res,"latency_ms":round((time.monotonic()-t0)*1000,1)})
+
+    def address_string(self):
+        # Unix-socket peers have no (host, port)
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads=True
+
+if __name__=="__main__":
+    ap=argparse.ArgumentParser(description="Resident federated search service")
+    ap.add_argument("--host", default="127.0.0.1"); ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--unix", help="listen on a Unix socket instead of TCP")
+    a=ap.parse_args()
+    if a.unix:
+        if os.path.exists(a.unix): os.unlink(a.unix)
+        srv=UnixHTTPServer(a.unix, Handler)
+    else:
+        srv=ThreadingHTTPServer((a.host,a.port), Handler)
+    try: srv.serve_forever()
+    except KeyboardInterrupt: pass
+    finally: srv.server_close()
@@ -0,0 +1,36 @@
+import sqlite3
+
+# Per-connection settings (journal_mode is stored in the file; the rest must be
+# set on every connection). synchronous=NORMAL is durable across application
+# crashes in WAL mode and only risks the last commits on power loss.
+PRAGMAS = (
+    ("busy_timeout", 5000),
+    ("synchronous", "NORMAL"),
+    ("cache_size", -65536),    # KiB: 64 MiB page cache
+    ("mmap_size", 268435456),  # 256 MiB of the file read through mmap
+    ("temp_store", "MEMORY"),
+)
+
+# Class of the connections connect() opens; the query-plan harness
+# (rockquant.db.query_plans) swaps in a subclass that explains every query.
+CONNECTION_FACTORY = sqlite3.Connection
+
+
+def tune(conn: sqlite3.Connection, wal: bool = True) -> sqlite3.Connection:
+    for name, value in PRAGMAS:
+        conn.execute(f"PRAGMA {name} = {value}")
+    if wal:
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+        except sqlite3.OperationalError:
+            pass
+    return conn
+
+
+def connect(db_path: str, readonly: bool = False) -> sqlite3.Connection:
+    """Open `db_path` with the standard PRAGMAs; `readonly` never creates or writes the file."""
+    if readonly:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=60,
+                               factory=CONNECTION_FACTORY)
+        return tune(conn, wal=False)
+    return tune(sqlite3.connect(db_path, timeout=60, factory=CONNECTION_FACTORY))
@@ -1,6 +1,22 @@
+import re
 import sqlite3
 from pathlib import Path
 
+ADD_COLUMN_RE = re.compile(r"ALTER\s+TABLE\s+(\w+)\s+ADD\s+COLUMN\s+(\w+)[^;]*;", re.I)
+
+
+def _skip_existing_columns(conn: sqlite3.Connection, sql: str) -> str:
+    """Drop ADD COLUMN statements for columns that already exist.
+
+    Some columns were first added outside migrations (events.source_entity_id
+    by older run_pipeline versions), so their migration must be a no-op there.
+    """
+    def keep(m):
+        cols = {r[1] for r in conn.execute(f"PRAGMA table_info({m.group(1)})")}
+        return "" if m.group(2) in cols else m.group(0)
+    return ADD_COLUMN_RE.sub(keep, sql)
+
+
 def migrate(db_path: str) -> None:
     conn = sqlite3.connect(db_path, timeout=60)
     try:
@@ -28,7 +44,7 @@ def migrate(db_path: str) -> None:
             version = int(mf.stem.split("_")[0])
             if version in applied:
                 continue
-            sql = mf.read_text(encoding="utf-8")
+            sql = _skip_existing_columns(conn, mf.read_text(encoding="utf-8"))
             cur.executescript(sql)
             cur.execute("INSERT INTO schema_migrations (version) VALUES (?)", (version,))
             conn.commit()
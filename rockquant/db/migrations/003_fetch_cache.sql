@@ -0,0 +1,12 @@
+-- 003_fetch_cache.sql: HTTP validators and content digests for listing pages
+
+CREATE TABLE IF NOT EXISTS fetch_cache (
+  url TEXT PRIMARY KEY,
+  etag TEXT,
+  last_modified TEXT,
+  content_sha256 TEXT,
+  status_code INTEGER,
+  content_length INTEGER,
+  fetched_at TEXT DEFAULT (datetime('now')),
+  checked_at TEXT DEFAULT (datetime('now'))
+);
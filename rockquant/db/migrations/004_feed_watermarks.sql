@@ -0,0 +1,11 @@
+-- 004_feed_watermarks.sql: Per-feed high-water marks for incremental crawls
+
+CREATE TABLE IF NOT EXISTS feed_watermarks (
+  feed_url TEXT PRIMARY KEY,
+  newest_event_key TEXT,
+  newest_event_date TEXT,
+  pages_crawled INTEGER NOT NULL DEFAULT 0,
+  items_seen INTEGER NOT NULL DEFAULT 0,
+  crawl_mode TEXT,
+  updated_at TEXT DEFAULT (datetime('now'))
+);
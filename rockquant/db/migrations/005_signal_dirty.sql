@@ -0,0 +1,8 @@
+-- 005_signal_dirty.sql: (event_date, source) buckets touched since signals were last generated
+
+CREATE TABLE IF NOT EXISTS signal_dirty (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  event_date TEXT NOT NULL,
+  source_entity_id TEXT,
+  marked_at TEXT DEFAULT (datetime('now'))
+);
@@ -0,0 +1,19 @@
+-- 006_page_archive.sql: Compressed, content-addressed archive of fetched listing pages
+
+CREATE TABLE IF NOT EXISTS page_archive (
+  content_sha256 TEXT PRIMARY KEY,
+  body_zlib BLOB NOT NULL,
+  size_bytes INTEGER NOT NULL,
+  created_at TEXT DEFAULT (datetime('now'))
+);
+
+CREATE TABLE IF NOT EXISTS page_fetches (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  url TEXT NOT NULL,
+  feed_url TEXT NOT NULL,
+  content_sha256 TEXT NOT NULL REFERENCES page_archive(content_sha256),
+  status_code INTEGER,
+  fetched_at TEXT DEFAULT (datetime('now'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_page_fetches_sha ON page_fetches(content_sha256);
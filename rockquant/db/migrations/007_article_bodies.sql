@@ -0,0 +1,11 @@
+-- 007_article_bodies.sql: Article bodies (content-addressed in page_archive) and extracted fields
+
+ALTER TABLE source_documents ADD COLUMN body_sha256 TEXT REFERENCES page_archive(content_sha256);
+ALTER TABLE source_documents ADD COLUMN body_status INTEGER;
+ALTER TABLE source_documents ADD COLUMN body_fetched_at TEXT;
+ALTER TABLE source_documents ADD COLUMN amount_usd REAL;
+ALTER TABLE source_documents ADD COLUMN project_names TEXT;
+
+-- Keeps "which articles still need a body" proportional to the backlog, not the archive.
+CREATE INDEX IF NOT EXISTS idx_source_documents_body_pending
+  ON source_documents(id) WHERE body_fetched_at IS NULL;
@@ -0,0 +1,20 @@
+-- 008_events_fts.sql: Full-text index over event titles and article bodies
+
+-- rowid = events.id. Titles are kept in sync by the triggers below; bodies are
+-- filled in when an article is fetched (rockquant.sources.fts.index_bodies).
+CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(title, body, tokenize = 'porter unicode61');
+
+CREATE TRIGGER IF NOT EXISTS events_fts_ai AFTER INSERT ON events BEGIN
+  INSERT INTO events_fts (rowid, title, body) VALUES (new.id, new.title, '');
+END;
+
+CREATE TRIGGER IF NOT EXISTS events_fts_au AFTER UPDATE OF title ON events
+WHEN new.title IS NOT old.title BEGIN
+  UPDATE events_fts SET title = new.title WHERE rowid = new.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS events_fts_ad AFTER DELETE ON events BEGIN
+  DELETE FROM events_fts WHERE rowid = old.id;
+END;
+
+INSERT INTO events_fts (rowid, title, body) SELECT id, title, '' FROM events;
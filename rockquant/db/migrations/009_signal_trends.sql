@@ -0,0 +1,22 @@
+-- 009_signal_trends.sql: Rolling-window trends over daily signal scores
+
+-- One row per calendar day per (signal_scope, signal_type) while the 90-day sum is non-zero.
+--   score       daily signal score (0 on days without a signal)
+--   sum_Nd      sum of score over the N days ending on signal_date
+--   zscore_7d   sum_7d against the mean/stddev of sum_7d over the last 90 days
+--   momentum    sum_7d/7 - sum_30d/30 (short-term minus medium-term daily rate)
+CREATE TABLE IF NOT EXISTS signal_trends (
+  signal_scope TEXT NOT NULL,
+  signal_type TEXT NOT NULL,
+  signal_date TEXT NOT NULL,
+  score REAL NOT NULL,
+  sum_7d REAL NOT NULL,
+  sum_30d REAL NOT NULL,
+  sum_90d REAL NOT NULL,
+  zscore_7d REAL,
+  momentum REAL NOT NULL,
+  computed_at TEXT DEFAULT (datetime('now')),
+  PRIMARY KEY (signal_scope, signal_type, signal_date)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_signal_trends_date ON signal_trends(signal_date);
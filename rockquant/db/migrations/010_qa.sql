@@ -0,0 +1,21 @@
+-- 010_qa.sql: Incremental data-quality checks
+
+-- Last row each table was checked up to (events by id, signals by created_at).
+CREATE TABLE IF NOT EXISTS qa_watermarks (
+  table_name TEXT PRIMARY KEY,
+  high_id INTEGER,
+  high_ts TEXT,
+  checked_at TEXT DEFAULT (datetime('now'))
+);
+
+CREATE TABLE IF NOT EXISTS qa_runs (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  mode TEXT NOT NULL,
+  violations INTEGER NOT NULL,
+  report TEXT NOT NULL,
+  ran_at TEXT DEFAULT (datetime('now'))
+);
+
+-- Duplicate title/url lookups for new events.
+CREATE INDEX IF NOT EXISTS idx_events_title ON events(title);
+CREATE INDEX IF NOT EXISTS idx_events_url ON events(url);
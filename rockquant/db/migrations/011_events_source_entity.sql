@@ -0,0 +1,26 @@
+-- 011_events_source_entity.sql: events.source_entity_id and indexes for the hot queries
+-- (rockquant.db.query_plans checks that they stay indexed)
+
+-- Skipped by migrate() on databases where run_pipeline already added the column.
+ALTER TABLE events ADD COLUMN source_entity_id TEXT;
+
+-- Signal engine: events of the dirty dates, covering (id is the rowid).
+-- Supersedes idx_events_date.
+CREATE INDEX IF NOT EXISTS idx_events_date_subtype ON events(event_date, event_subtype, source_entity_id);
+DROP INDEX IF EXISTS idx_events_date;
+
+-- Per-source scans (reclassify --source, QA and exports by source).
+CREATE INDEX IF NOT EXISTS idx_events_source_entity ON events(source_entity_id, event_date);
+
+-- Trends, QA and exports find signals written since a watermark.
+CREATE INDEX IF NOT EXISTS idx_signals_created ON signals(created_at);
+
+-- Last trends run.
+CREATE INDEX IF NOT EXISTS idx_signal_trends_computed ON signal_trends(computed_at);
+
+-- Article retries, export change detection and month partitions.
+CREATE INDEX IF NOT EXISTS idx_source_documents_body_retry
+  ON source_documents(id) WHERE body_sha256 IS NULL AND body_fetched_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_source_documents_fetched ON source_documents(fetched_at);
+CREATE INDEX IF NOT EXISTS idx_source_documents_body_fetched ON source_documents(body_fetched_at);
+CREATE INDEX IF NOT EXISTS idx_source_documents_published ON source_documents(published_date);
@@ -0,0 +1,12 @@
+-- 012_pipeline_runs.sql: Per-run pipeline instrumentation reports
+
+CREATE TABLE IF NOT EXISTS pipeline_runs (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  status TEXT NOT NULL,
+  duration_s REAL NOT NULL,
+  report TEXT NOT NULL,
+  started_at TEXT NOT NULL,
+  finished_at TEXT DEFAULT (datetime('now'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_pipeline_runs_started ON pipeline_runs(started_at);
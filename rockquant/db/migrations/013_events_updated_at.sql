@@ -0,0 +1,17 @@
+-- 013_events_updated_at.sql: Change marker for events updated in place
+-- (re-crawled with a new title/date, reclassified, ...), so incremental QA
+-- rechecks them. NULL until the first real change; upserts that rewrite the
+-- same values do not touch it.
+
+ALTER TABLE events ADD COLUMN updated_at TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_events_updated ON events(updated_at);
+
+CREATE TRIGGER IF NOT EXISTS events_touch_au
+AFTER UPDATE OF title, event_date, url, event_type, event_subtype, source_doc_id, source_entity_id ON events
+WHEN new.title IS NOT old.title OR new.event_date IS NOT old.event_date OR new.url IS NOT old.url
+  OR new.event_type IS NOT old.event_type OR new.event_subtype IS NOT old.event_subtype
+  OR new.source_doc_id IS NOT old.source_doc_id OR new.source_entity_id IS NOT old.source_entity_id
+BEGIN
+  UPDATE events SET updated_at = datetime('now') WHERE id = new.id;
+END;
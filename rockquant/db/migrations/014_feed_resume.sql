@@ -0,0 +1,12 @@
+-- 014_feed_resume.sql: Where an interrupted crawl picks up again
+
+-- Set when a crawl stops on an error, the run deadline or max_pages before
+-- reaching known rows. resume_url/resume_page: the first page not ingested
+-- (and its depth); resume_floor: the deepest such page of any interrupted run,
+-- above which a page of known rows does not end the crawl. pending_event_*:
+-- the newest item seen, which becomes newest_event_* once the gap is closed.
+ALTER TABLE feed_watermarks ADD COLUMN resume_url TEXT;
+ALTER TABLE feed_watermarks ADD COLUMN resume_page INTEGER;
+ALTER TABLE feed_watermarks ADD COLUMN resume_floor INTEGER;
+ALTER TABLE feed_watermarks ADD COLUMN pending_event_key TEXT;
+ALTER TABLE feed_watermarks ADD COLUMN pending_event_date TEXT;
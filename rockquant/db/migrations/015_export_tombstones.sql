@@ -0,0 +1,33 @@
+-- 015_export_tombstones.sql: Old partition dates of exported rows that were
+-- deleted or moved to another date, so incremental exports rewrite (or drop)
+-- the month partitions they left (rockquant.qa.exports)
+
+CREATE TABLE IF NOT EXISTS export_tombstones (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  table_name TEXT NOT NULL,
+  old_date TEXT,
+  created_at TEXT DEFAULT (datetime('now'))
+);
+
+-- Stale signal buckets dropped by the signal engine, and replay rebuilds.
+CREATE TRIGGER IF NOT EXISTS export_tombstones_signals_ad AFTER DELETE ON signals BEGIN
+  INSERT INTO export_tombstones (table_name, old_date) VALUES ('signals', old.signal_date);
+END;
+
+CREATE TRIGGER IF NOT EXISTS export_tombstones_events_ad AFTER DELETE ON events BEGIN
+  INSERT INTO export_tombstones (table_name, old_date) VALUES ('events', old.event_date);
+END;
+
+CREATE TRIGGER IF NOT EXISTS export_tombstones_events_au AFTER UPDATE OF event_date ON events
+WHEN new.event_date IS NOT old.event_date BEGIN
+  INSERT INTO export_tombstones (table_name, old_date) VALUES ('events', old.event_date);
+END;
+
+CREATE TRIGGER IF NOT EXISTS export_tombstones_documents_au AFTER UPDATE OF published_date ON source_documents
+WHEN new.published_date IS NOT old.published_date BEGIN
+  INSERT INTO export_tombstones (table_name, old_date) VALUES ('source_documents', old.published_date);
+END;
+
+CREATE TRIGGER IF NOT EXISTS export_tombstones_documents_ad AFTER DELETE ON source_documents BEGIN
+  INSERT INTO export_tombstones (table_name, old_date) VALUES ('source_documents', old.published_date);
+END;
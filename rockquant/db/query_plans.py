@@ -0,0 +1,232 @@
+"""Query-plan regression harness.
+
+Runs the production code paths (ingest, signals, trends, reclassify, QA,
+exports, replay) against a synthetic database with every connection routed
+through PlanConnection, which runs EXPLAIN QUERY PLAN before each statement.
+A statement whose plan scans a whole table is a failure unless its phase
+allows scanning that table (full rebuilds, tiny bookkeeping tables).
+
+    python -m rockquant.db.query_plans [--events 5000] [--json]
+
+Exits 1 when a query regressed to a full table scan.
+"""
+import argparse
+import json
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+
+import rockquant.db.connection as connection
+from rockquant.db.migrate import migrate
+
+EXPLAINABLE_RE = re.compile(r"^\s*(SELECT|WITH|INSERT|UPDATE|DELETE|CREATE\s+TEMP\s+TABLE\s+\w+\s+AS)\b", re.I)
+SCAN_RE = re.compile(r"^SCAN (\w+)(.*)$")
+TABLE_REF_RE = re.compile(r"\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.I)
+NOT_ALIASES = {"ON", "WHERE", "JOIN", "LEFT", "CROSS", "INNER", "GROUP", "ORDER", "LIMIT",
+               "USING", "SET", "VALUES", "SELECT", "AS", "DEFAULT", "WHEN"}
+
+
+class PlanRecorder:
+    def __init__(self):
+        self.phase = None
+        self.allow = frozenset()
+        self.records = []
+        self.tables = set()
+
+    @contextmanager
+    def run_phase(self, name: str, allow: tuple = ()):
+        self.phase, self.allow = name, frozenset(allow)
+        try:
+            yield
+        finally:
+            self.phase, self.allow = None, frozenset()
+
+    def record(self, sql: str, plan: list) -> None:
+        aliases = {}
+        for table, alias in TABLE_REF_RE.findall(sql):
+            aliases[table] = table
+            if alias and alias.upper() not in NOT_ALIASES:
+                aliases[alias] = table
+        scans = []
+        for detail in plan:
+            m = SCAN_RE.match(detail)
+            if not m or "VIRTUAL TABLE" in m.group(2):
+                continue
+            table = aliases.get(m.group(1), m.group(1))
+            if table in self.tables and table not in self.allow:
+                scans.append(table)
+        self.records.append({
+            "phase": self.phase,
+            "sql": " ".join(sql.split()),
+            "plan": plan,
+            "full_scans": sorted(set(scans)),
+        })
+
+
+RECORDER = PlanRecorder()
+
+
+class PlanCursor(sqlite3.Cursor):
+    def execute(self, sql, parameters=()):
+        self.connection.explain(sql, parameters)
+        return super().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        rows = list(seq_of_parameters)
+        if rows:
+            self.connection.explain(sql, rows[0])
+        return super().executemany(sql, rows)
+
+
+class PlanConnection(sqlite3.Connection):
+    def cursor(self, factory=PlanCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def explain(self, sql: str, parameters) -> None:
+        if RECORDER.phase is None or not EXPLAINABLE_RE.match(sql):
+            return
+        try:
+            plan = sqlite3.Cursor(self).execute("EXPLAIN QUERY PLAN " + sql, parameters).fetchall()
+        except sqlite3.Error:
+            return  # e.g. refers to a temp table the statement itself creates
+        RECORDER.record(sql, [row[3] for row in plan])
+
+
+def synthetic_items(n: int, seed: int = 7) -> list:
+    from rockquant.sources.registry import DOE_LPO, FAST41_COUN
+
+    rng = random.Random(seed)
+    words = ("loan", "guarantee", "conditional", "commitment", "permitting", "dashboard",
+             "project", "lithium", "geothermal", "nuclear", "closes", "announces")
+    items = []
+    for i in range(n):
+        source = DOE_LPO if i % 3 else FAST41_COUN
+        title = " ".join(rng.choice(words) for _ in range(6)).capitalize() + f" {i}"
+        day = date(2020, 1, 1) + timedelta(days=rng.randrange(1500))
+        items.append({
+            "url": f"https://example.test/{source.entity_id}/articles/{i}",
+            "title": title,
+            "event_date": day.isoformat(),
+            "canonical_key": f"k{i}",
+            "raw_html": None,
+            "event_subtype": source.classify_titles([title])[0],
+            "source_entity_id": source.entity_id,
+        })
+    return items
+
+
+def run_workload(db_path: str, events: int = 5000) -> None:
+    from rockquant.qa.checks import run_checks
+    from rockquant.qa.exports import export_artifacts
+    from rockquant.sources.articles import pending_articles
+    from rockquant.sources.cache import load_cache
+    from rockquant.sources.crawl import known_keys, load_watermarks, store_watermark
+    from rockquant.sources.ingest import clear_dirty, ingest_batch, load_dirty
+    from rockquant.sources.reclassify import reclassify_events
+    from rockquant.sources.registry import FAST41_COUN
+    from rockquant.sources.replay import replay
+    from rockquant.sources.signals import run_signal_engine
+    from rockquant.sources.trends import load_trend, update_trends
+
+    migrate(db_path)
+    items = synthetic_items(events)
+    conn = connection.connect(db_path)
+    try:
+        with RECORDER.run_phase("ingest", allow=("feed_watermarks",)):
+            for i in range(0, len(items), 500):
+                ingest_batch(conn, items[i:i + 500])
+            ingest_batch(conn, items[:50])  # updates
+            known_keys(conn, [it["canonical_key"] for it in items[:200]])
+            load_cache(conn, [it["url"] for it in items[:200]])
+            load_watermarks(conn)
+            store_watermark(conn, "https://example.test/feed", {"canonical_key": "k1",
+                            "event_date": "2024-01-01"}, 1, 10, "incremental")
+            conn.commit()
+        with RECORDER.run_phase("full signal rebuild", allow=("events", "signals", "signal_dirty")):
+            run_signal_engine(conn, dirty=None)
+            conn.execute("DELETE FROM signal_dirty")
+            conn.commit()
+        with RECORDER.run_phase("incremental signals", allow=("signal_dirty",)):
+            ingest_batch(conn, synthetic_items(events + 100, seed=8)[events:])
+            dirty, high = load_dirty(conn)
+            run_signal_engine(conn, dirty=dirty)
+            clear_dirty(conn, high)
+            conn.commit()
+        with RECORDER.run_phase("trends"):
+            update_trends(conn, full=True)
+            conn.commit()
+            update_trends(conn)
+            load_trend(conn, "funding_velocity", start="2021-01-01", end="2021-12-31")
+            conn.commit()
+        with RECORDER.run_phase("articles"):
+            pending_articles(conn, 100, retry_failed=True)
+            conn.execute("SELECT COUNT(*) FROM source_documents WHERE body_fetched_at IS NULL").fetchone()
+    finally:
+        conn.close()
+
+    with RECORDER.run_phase("reclassify", allow=("signal_dirty",)):
+        reclassify_events(db_path, chunk_size=2000, source_entity_id=FAST41_COUN.entity_id)
+    with RECORDER.run_phase("qa (incremental)", allow=("qa_watermarks",)):
+        run_checks(db_path)
+    with tempfile.TemporaryDirectory() as export_dir:
+        with RECORDER.run_phase("export (full)", allow=("events", "signals", "source_documents")):
+            export_artifacts(db_path, export_dir, formats=("csv",))
+        conn = connection.connect(db_path)
+        try:
+            ingest_batch(conn, synthetic_items(events + 120, seed=9)[events + 100:])
+            conn.commit()
+        finally:
+            conn.close()
+        with RECORDER.run_phase("export (incremental)"):
+            export_artifacts(db_path, export_dir, formats=("csv",))
+    # replay reports COUNT(*) of events, which always walks an index
+    with RECORDER.run_phase("replay", allow=("page_fetches", "signal_dirty", "events")):
+        replay(db_path)
+
+
+def check_query_plans(events: int = 5000) -> dict:
+    """Run the workload on a fresh database; returns {queries, regressions, records}."""
+    RECORDER.records = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "plans.db")
+        migrate(db_path)
+        conn = sqlite3.connect(db_path)
+        RECORDER.tables = {r[0] for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")}
+        conn.close()
+        previous = connection.CONNECTION_FACTORY
+        connection.CONNECTION_FACTORY = PlanConnection
+        try:
+            run_workload(db_path, events)
+        finally:
+            connection.CONNECTION_FACTORY = previous
+    regressions = [r for r in RECORDER.records if r["full_scans"]]
+    return {"queries": len(RECORDER.records), "regressions": regressions, "records": RECORDER.records}
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Fail when a production query plans a full table scan")
+    ap.add_argument("--events", type=int, default=5000)
+    ap.add_argument("--json", action="store_true", help="print every query and its plan")
+    args = ap.parse_args()
+    result = check_query_plans(args.events)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        for r in result["regressions"]:
+            print(f"[{r['phase']}] full scan of {', '.join(r['full_scans'])}: {r['sql'][:160]}")
+            for detail in r["plan"]:
+                print(f"    {detail}")
+        print(f"{result['queries']} queries checked, {len(result['regressions'])} full-scan regressions")
+    sys.exit(1 if result["regressions"] else 0)
@@ -1,10 +1,202 @@
+import json
 import sqlite3
+import time
 
-def run_checks(db_path: str) -> dict:
-    conn = sqlite3.connect(db_path, timeout=60)
+from rockquant.db.connection import connect
+from rockquant.db.migrate import migrate
+
+UNKNOWN_SUBTYPE = "EVENT_UNKNOWN"
+DATE_GLOB = "[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]"
+
+# Every check reads only the rows staged in _qa_events / _qa_signals, so an
+# incremental run costs what changed since the last run, not the table size.
+# CROSS JOIN pins the staged table as the outer loop; without statistics the
+# planner may otherwise scan events and probe the (small) staged table.
+# name -> (SQL returning one row per violation, sample columns)
+ROW_CHECKS = {
+    "duplicate_titles": """
+        SELECT n.id, o.id AS other_id, n.title
+        FROM _qa_events q
+        CROSS JOIN events n ON n.id = q.id
+        JOIN events o ON o.title = n.title AND o.canonical_event_key <> n.canonical_event_key
+        GROUP BY n.id
+    """,
+    "duplicate_urls": """
+        SELECT n.id, o.id AS other_id, n.url
+        FROM _qa_events q
+        CROSS JOIN events n ON n.id = q.id
+        JOIN events o ON o.url = n.url AND o.canonical_event_key <> n.canonical_event_key
+        WHERE n.url IS NOT NULL AND n.url <> ''
+        GROUP BY n.id
+    """,
+    "malformed_event_dates": f"""
+        SELECT n.id, n.event_date
+        FROM _qa_events q
+        CROSS JOIN events n ON n.id = q.id
+        WHERE n.event_date NOT GLOB '{DATE_GLOB}'
+           OR date(n.event_date, '+0 days') IS NOT n.event_date  -- '+0 days' rolls 02-30 over
+    """,
+    "future_event_dates": f"""
+        SELECT n.id, n.event_date
+        FROM _qa_events q
+        CROSS JOIN events n ON n.id = q.id
+        WHERE n.event_date GLOB '{DATE_GLOB}' AND n.event_date > date('now', '+1 day')
+    """,
+    "missing_source_documents": """
+        SELECT n.id, n.source_doc_id
+        FROM _qa_events q
+        CROSS JOIN events n ON n.id = q.id
+        LEFT JOIN source_documents d ON d.id = n.source_doc_id
+        WHERE n.source_doc_id IS NOT NULL AND d.id IS NULL
+    """,
+    "orphan_signal_events": """
+        SELECT s.id, s.signal_date, s.signal_type, j.value AS event_id
+        FROM _qa_signals q
+        CROSS JOIN signals s ON s.id = q.id
+        JOIN json_each(s.supporting_event_ids) j
+        LEFT JOIN events e ON e.id = j.value
+        WHERE e.id IS NULL
+    """,
+    "score_drift": """
+        SELECT t.signal_scope, t.signal_type, t.signal_date, t.zscore_7d
+        FROM signal_trends t
+        WHERE t.signal_date IN (SELECT s.signal_date FROM _qa_signals q CROSS JOIN signals s ON s.id = q.id)
+          AND abs(t.zscore_7d) >= :drift_z
+    """,
+}
+
+
+def _stage(conn: sqlite3.Connection, full: bool) -> dict:
+    """Fill _qa_events / _qa_signals with the rows to check; returns the new watermarks.
+
+    Events are staged when new (id) or changed in place (updated_at, migration 013).
+    """
+    marks = dict((r[0], r[1:]) for r in conn.execute(
+        "SELECT table_name, high_id, high_ts FROM qa_watermarks"))
+    since_id = 0 if full else (marks.get("events", (None, None))[0] or 0)
+    upd_id, upd_ts = (0, "") if full else (marks.get("events_updated") or (0, ""))
+    upd_id, upd_ts = upd_id or 0, upd_ts or ""
+    # signals: (created_at, id) of the last row checked; ties on the second go by id
+    sig_id, since_ts = (0, "") if full else (marks.get("signals") or (0, ""))
+    sig_id, since_ts = sig_id or 0, since_ts or ""
+    for name in ("_qa_events", "_qa_signals"):
+        conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS {name} (id INTEGER PRIMARY KEY)")
+        conn.execute(f"DELETE FROM {name}")
+    # Bounded by the highs read up front, so rows written meanwhile wait for the next run.
+    high_id = conn.execute("SELECT MAX(id) FROM events").fetchone()[0] or since_id
+    high_ts = conn.execute("SELECT MAX(created_at) FROM signals").fetchone()[0] or since_ts
+    high_sig = conn.execute("SELECT MAX(id) FROM signals WHERE created_at = ?", (high_ts,)).fetchone()[0] or 0
+    high_upd = conn.execute("SELECT MAX(updated_at) FROM events").fetchone()[0] or upd_ts
+    high_upd_id = conn.execute("SELECT MAX(id) FROM events WHERE updated_at = ?", (high_upd,)).fetchone()[0] or 0
+    conn.execute("INSERT INTO _qa_events SELECT id FROM events WHERE id > ? AND id <= ?", (since_id, high_id))
+    if not full:
+        conn.execute("""
+            INSERT OR IGNORE INTO _qa_events
+            SELECT id FROM events
+            WHERE (updated_at > ? OR (updated_at = ? AND id > ?))
+              AND (updated_at < ? OR (updated_at = ? AND id <= ?))
+        """, (upd_ts, upd_ts, upd_id, high_upd, high_upd, high_upd_id))
+    conn.execute("""
+        INSERT INTO _qa_signals
+        SELECT id FROM signals
+        WHERE (created_at > ? OR (created_at = ? AND id > ?))
+          AND (created_at < ? OR (created_at = ? AND id <= ?))
+    """, (since_ts, since_ts, sig_id, high_ts, high_ts, high_sig))
+    return {"events": (high_id, None), "events_updated": (high_upd_id, high_upd),
+            "signals": (high_sig, high_ts)}
+
+
+def _staged_fk_violations(conn: sqlite3.Connection) -> list:
+    """PRAGMA foreign_key_check rows (table, rowid, parent, fkid) for the staged rows only."""
+    out = []
+    for table, staged in (("events", "_qa_events"), ("signals", "_qa_signals")):
+        fks = {}
+        for fkid, _, parent, col, to, *_ in conn.execute(f"PRAGMA foreign_key_list({table})"):
+            fks.setdefault((fkid, parent), []).append((col, to or "rowid"))
+        for (fkid, parent), cols in fks.items():
+            on = " AND ".join(f"p.{to} = n.{col}" for col, to in cols)
+            set_ = " AND ".join(f"n.{col} IS NOT NULL" for col, _ in cols)
+            out += conn.execute(f"""
+                SELECT '{table}', n.id, '{parent}', {fkid}
+                FROM {staged} q
+                CROSS JOIN {table} n ON n.id = q.id
+                WHERE {set_} AND NOT EXISTS (SELECT 1 FROM {parent} p WHERE {on})
+            """).fetchall()
+    return out
+
+
+def _unknown_rates(conn: sqlite3.Connection, max_rate: float, min_events: int) -> tuple:
+    rows = conn.execute("""
+        SELECT n.source_entity_id, COUNT(*), SUM(n.event_subtype IS NULL OR n.event_subtype = ?)
+        FROM _qa_events q
+        CROSS JOIN events n ON n.id = q.id
+        GROUP BY n.source_entity_id
+    """, (UNKNOWN_SUBTYPE,)).fetchall()
+    rates = {src or "": {"events": n, "unknown": u, "rate": round(u / n, 4)} for src, n, u in rows}
+    flagged = [src for src, r in rates.items() if r["events"] >= min_events and r["rate"] > max_rate]
+    return len(flagged), rates
+
+
+def run_checks(db_path: str, full: bool = False, max_unknown_rate: float = 0.5,
+               min_events: int = 20, drift_z: float = 3.0, sample_size: int = 10) -> dict:
+    """Run the data-quality checks over rows changed since the last QA run.
+
+    Events newer than the events watermark or updated in place since the last
+    run, and signals written since the signals watermark, are checked; `full`
+    checks everything. Foreign keys of the staged rows are always checked
+    (the whole database with PRAGMA foreign_key_check when `full`) and
+    counted in fk_violations. Each check reports its violation count, up to
+    `sample_size` offending rows and its time in ms. The report is kept in
+    qa_runs and the watermarks advance in the same transaction.
+    """
+    migrate(db_path)
+    conn = connect(db_path)
     try:
         conn.execute("PRAGMA foreign_keys = ON;")
-        fk = conn.execute("PRAGMA foreign_key_check;").fetchall()
-        return {"fk_violations": len(fk)}
+        t0 = time.perf_counter()
+        marks = _stage(conn, full)
+        report = {
+            "mode": "full" if full else "incremental",
+            "events_checked": conn.execute("SELECT COUNT(*) FROM _qa_events").fetchone()[0],
+            "signals_checked": conn.execute("SELECT COUNT(*) FROM _qa_signals").fetchone()[0],
+            "checks": {},
+        }
+        checks = report["checks"]
+        for name, sql in ROW_CHECKS.items():
+            t = time.perf_counter()
+            cur = conn.execute(sql, {"drift_z": drift_z} if ":drift_z" in sql else ())
+            cols = [d[0] for d in cur.description]
+            rows = cur.fetchall()
+            checks[name] = {
+                "violations": len(rows),
+                "samples": [dict(zip(cols, r)) for r in rows[:sample_size]],
+                "ms": round((time.perf_counter() - t) * 1000, 2),
+            }
+
+        t = time.perf_counter()
+        flagged, rates = _unknown_rates(conn, max_unknown_rate, min_events)
+        checks["unknown_subtype_rate"] = {
+            "violations": flagged, "by_source": rates,
+            "ms": round((time.perf_counter() - t) * 1000, 2),
+        }
+        t = time.perf_counter()
+        fk = conn.execute("PRAGMA foreign_key_check;").fetchall() if full else _staged_fk_violations(conn)
+        checks["foreign_keys"] = {
+            "violations": len(fk), "samples": [list(r) for r in fk[:sample_size]],
+            "ms": round((time.perf_counter() - t) * 1000, 2),
+        }
+        report["fk_violations"] = len(fk)
+
+        report["violations"] = sum(c["violations"] for c in checks.values())
+        report["ms"] = round((time.perf_counter() - t0) * 1000, 2)
+        conn.execute("INSERT INTO qa_runs (mode, violations, report) VALUES (?, ?, ?)",
+                     (report["mode"], report["violations"], json.dumps(report)))
+        conn.executemany("""
+            INSERT INTO qa_watermarks (table_name, high_id, high_ts) VALUES (?, ?, ?)
+            ON CONFLICT(table_name) DO UPDATE SET
+              high_id = excluded.high_id, high_ts = excluded.high_ts, checked_at = datetime('now')
+        """, [(table, high_id, high_ts) for table, (high_id, high_ts) in marks.items()])
+        conn.commit()
+        return report
     finally:
         conn.close()
@@ -1,5 +1,278 @@
+import csv
+import json
+import os
+import sqlite3
 from pathlib import Path
 
-def export_artifacts(db_path: str, export_dir: str) -> dict:
-    Path(export_dir).mkdir(parents=True, exist_ok=True)
-    return {"export_dir": export_dir, "db_path": db_path}
+from rockquant.db.connection import connect
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAVE_PYARROW = True
+except ImportError:
+    HAVE_PYARROW = False
+
+# table -> (partition date column, exported columns, change-marker columns).
+# A row changed since the watermark when any marker column moved past its
+# (value, id) mark; events.updated_at (migration 013) catches edits in place.
+# raw_html is left out of the source_documents export; the article archive
+# keeps the markup.
+EXPORTS = {
+    "events": (
+        "event_date",
+        ("id", "canonical_event_key", "event_date", "title", "url", "event_type",
+         "event_subtype", "source_entity_id", "source_doc_id", "created_at"),
+        ("id", "updated_at"),
+    ),
+    "signals": (
+        "signal_date",
+        ("id", "signal_date", "signal_type", "signal_scope", "score", "evidence_count",
+         "supporting_event_ids", "created_at"),
+        ("created_at",),
+    ),
+    "source_documents": (
+        "published_date",
+        ("id", "url", "published_date", "fetched_at", "body_sha256", "body_status",
+         "body_fetched_at", "amount_usd", "project_names"),
+        ("fetched_at", "body_fetched_at"),
+    ),
+}
+# Old dates of deleted or re-dated rows, filled by triggers (migration 015); the
+# months they left since the watermark are rewritten too.
+TOMBSTONES = "export_tombstones"
+WATERMARK_FILE = "_watermarks.json"
+
+
+def _partition(value) -> str:
+    """Month partition (YYYY-MM) of an ISO date; 'unknown' when missing."""
+    return value[:7] if value and len(value) >= 7 else "unknown"
+
+
+class _PartitionWriter:
+    """Writes one partition of a table in every format, via temp files."""
+
+    def __init__(self, out: Path, partition: str, columns: tuple, formats: tuple, schema=None):
+        self.columns = columns
+        self.schema = schema
+        self.paths = []
+        self.csv_file = self.parquet = self.parquet_path = None
+        for fmt in formats:
+            (out / fmt / partition).mkdir(parents=True, exist_ok=True)
+        if "csv" in formats:
+            path = out / "csv" / partition / "part.csv"
+            self.paths.append(path)
+            self.csv_file = open(f"{path}.tmp", "w", newline="", encoding="utf-8")
+            self.csv = csv.writer(self.csv_file)
+            self.csv.writerow(columns)
+        if "parquet" in formats:
+            path = out / "parquet" / partition / "part.parquet"
+            self.paths.append(path)
+            self.parquet_path = f"{path}.tmp"
+
+    def write(self, rows: list) -> None:
+        if self.csv_file is not None:
+            self.csv.writerows(rows)
+        if self.parquet_path is not None:
+            if self.parquet is None:
+                self.parquet = pq.ParquetWriter(self.parquet_path, self.schema)
+            self.parquet.write_table(pa.Table.from_pydict(
+                {c: [r[i] for r in rows] for i, c in enumerate(self.columns)}, schema=self.schema))
+
+    def close(self) -> None:
+        if self.csv_file is not None:
+            self.csv_file.close()
+        if self.parquet is not None:
+            self.parquet.close()
+        for path in self.paths:
+            if os.path.exists(f"{path}.tmp"):
+                os.replace(f"{path}.tmp", path)
+
+
+def _arrow_schema(conn: sqlite3.Connection, table: str, columns: tuple):
+    """Parquet schema from the declared SQLite column types (every column nullable)."""
+    if not HAVE_PYARROW:
+        return None
+    declared = {r[1]: (r[2] or "").upper() for r in conn.execute(f"PRAGMA table_info({table})")}
+    types = {"INTEGER": pa.int64(), "REAL": pa.float64()}
+    return pa.schema([(c, types.get(declared.get(c), pa.string())) for c in columns])
+
+
+def _partition_sql(date_col: str) -> str:
+    return f"CASE WHEN length({date_col}) >= 7 THEN substr({date_col}, 1, 7) END"
+
+
+def _marks(conn: sqlite3.Connection, table: str, cols: tuple) -> dict:
+    """{column: [value, id]} of the newest row by each marker column; id is the
+    tiebreak among rows sharing a one-second timestamp."""
+    marks = {}
+    for c in cols:
+        high = conn.execute(f"SELECT MAX({c}) FROM {table}").fetchone()[0]
+        if high is None:
+            continue
+        if c == "id":
+            marks[c] = high
+        else:
+            high_id = conn.execute(f"SELECT MAX(id) FROM {table} WHERE {c} = ?", (high,)).fetchone()[0]
+            marks[c] = [high, high_id]
+    return marks
+
+
+def _changed(cols: tuple, since) -> list:
+    """[(SQL condition, params)], one per marker column, for rows past the
+    watermark `since`; each is its own index range, so they are queried apart.
+
+    Watermarks from before the (value, id) format are bare values, compared
+    inclusively as they were written.
+    """
+    if not isinstance(since, dict):
+        since = {cols[0]: since if cols[0] == "id" else [since, 0]}
+    terms = []
+    for c in cols:
+        # No mark yet (the column was empty last time): everything set counts.
+        mark = since.get(c, 0 if c == "id" else ["", 0])
+        if c == "id":
+            terms.append(("id > ?", (mark,)))
+        else:
+            # The range term keeps the index seek; ties on the value go by id.
+            terms.append((f"{c} >= ? AND ({c} > ? OR id > ?)", (mark[0], mark[0], mark[1])))
+    return terms
+
+
+def _fetch_chunks(cursors, chunk_rows: int):
+    for cur in cursors:
+        while True:
+            chunk = cur.fetchmany(chunk_rows)
+            if not chunk:
+                break
+            yield chunk
+
+
+def _all_months(conn: sqlite3.Connection, table: str, date_col: str) -> tuple:
+    """(months, has_unknown) of the whole table, one index seek per month."""
+    months, lo = [], ""
+    while True:
+        d = conn.execute(f"SELECT MIN({date_col}) FROM {table} WHERE {date_col} >= ?", (lo,)).fetchone()[0]
+        if d is None:
+            break
+        if len(d) >= 7:
+            months.append(d[:7])
+            lo = d[:7] + "~"
+        else:
+            lo = d + "\x00"  # too short for a month: lands in 'unknown'
+    unknown = conn.execute(
+        f"SELECT 1 FROM {table} WHERE {_partition_sql(date_col)} IS NULL LIMIT 1").fetchone()
+    return months, unknown is not None
+
+
+def _month_cursors(conn: sqlite3.Connection, select: str, date_col: str, months: list, unknown: bool):
+    """Yield one cursor per partition, each opened only when the previous one is
+    drained. Months are index ranges in index order, so nothing is sorted and
+    memory does not grow with the table."""
+    if unknown:
+        yield conn.execute(f"{select} WHERE {_partition_sql(date_col)} IS NULL ORDER BY id")
+    for m in sorted(months):
+        yield conn.execute(f"{select} WHERE {date_col} >= ? AND {date_col} < ? ORDER BY {date_col}",
+                           (m, m + "~"))
+
+
+def _export_table(conn: sqlite3.Connection, table: str, out: Path, formats: tuple,
+                  since, chunk_rows: int) -> dict:
+    date_col, columns, wm_cols = EXPORTS[table]
+    # One MAX() per query, so each is a single index seek.
+    watermark = _marks(conn, table, wm_cols)
+    removed = conn.execute(f"SELECT MAX(id) FROM {TOMBSTONES}").fetchone()[0]
+    if removed is not None:
+        watermark["removed"] = removed
+    watermark = watermark or None
+    select = f"SELECT {', '.join(columns)} FROM {table}"
+    if since is None:
+        months, unknown = _all_months(conn, table, date_col)
+    else:
+        # Whole partitions are rewritten, so a partition with any changed row is
+        # re-exported.
+        found = set()
+        for changed, params in _changed(wm_cols, since):
+            found.update(r[0] for r in conn.execute(
+                f"SELECT DISTINCT {_partition_sql(date_col)} FROM {table} WHERE {changed}", params))
+        since_removed = since.get("removed", 0) if isinstance(since, dict) else 0
+        found.update(r[0] for r in conn.execute(
+            f"SELECT DISTINCT {_partition_sql('old_date')} FROM {TOMBSTONES} WHERE id > ? AND table_name = ?",
+            (since_removed, table)))
+        if not found:
+            return {"rows": 0, "partitions": 0, "watermark": since}
+        months, unknown = [m for m in found if m is not None], None in found
+    cursors = _month_cursors(conn, select, date_col, months, unknown)
+
+    date_idx = columns.index(date_col)
+    schema = _arrow_schema(conn, table, columns) if "parquet" in formats else None
+    rows = partitions = 0
+    written = set()
+    writer = current = None
+    try:
+        for chunk in _fetch_chunks(cursors, chunk_rows):
+            start = 0
+            for i, row in enumerate(chunk):
+                part = _partition(row[date_idx])
+                if part != current:
+                    if writer is not None:
+                        writer.write(chunk[start:i])
+                        writer.close()
+                    current = part
+                    writer = _PartitionWriter(out, f"{table}/month={part}", columns, formats, schema)
+                    written.add(part)
+                    partitions += 1
+                    start = i
+            writer.write(chunk[start:])
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    # A changed month with no rows left (all deleted or moved away) loses its files.
+    for part in set(months) | ({"unknown"} if unknown else set()):
+        if part not in written:
+            for fmt in formats:
+                (out / fmt / table / f"month={part}" / f"part.{fmt}").unlink(missing_ok=True)
+    return {"rows": rows, "partitions": partitions, "watermark": watermark}
+
+
+def export_artifacts(db_path: str, export_dir: str, tables: tuple | None = None,
+                     formats: tuple | None = None, incremental: bool = True,
+                     chunk_rows: int = 50000) -> dict:
+    """Export events, signals and source_documents as month-partitioned files.
+
+    Layout is <export_dir>/<format>/<table>/month=YYYY-MM/part.<format>, the
+    month taken from the table's date column; Parquet is written only when
+    pyarrow is installed. Rows are streamed from
+    one read-only snapshot in chunks of `chunk_rows`, so memory does not grow
+    with the table. With `incremental`, only partitions holding rows changed
+    since the watermarks in <export_dir>/_watermarks.json are rewritten.
+    New, re-fetched and updated rows count as changed, as do the months that
+    deleted or re-dated rows left; a month left empty has its files removed.
+    """
+    out = Path(export_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    formats = tuple(formats or (("csv", "parquet") if HAVE_PYARROW else ("csv",)))
+    if "parquet" in formats and not HAVE_PYARROW:
+        raise RuntimeError("parquet export requires pyarrow")
+    wm_path = out / WATERMARK_FILE
+    watermarks = json.loads(wm_path.read_text()) if incremental and wm_path.exists() else {}
+
+    conn = connect(db_path, readonly=True)
+    result = {"export_dir": export_dir, "db_path": db_path, "formats": list(formats), "tables": {}}
+    try:
+        conn.execute("BEGIN")  # one consistent snapshot; WAL readers do not block ingestion
+        for table in tables or tuple(EXPORTS):
+            r = _export_table(conn, table, out, formats, watermarks.get(table), chunk_rows)
+            result["tables"][table] = r
+            if r["watermark"] is not None:
+                watermarks[table] = r["watermark"]
+        conn.rollback()
+    finally:
+        conn.close()
+
+    tmp = f"{wm_path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(watermarks, f, indent=2)
+    os.replace(tmp, wm_path)
+    return result
@@ -0,0 +1,37 @@
+import sqlite3
+import zlib
+
+from rockquant.sources.cache import content_digest
+
+
+def store_body(conn: sqlite3.Connection, result: dict) -> str:
+    """Store a fetched page once per content digest; returns the digest.
+
+    The decoded text is archived (UTF-8, zlib) so a replay parses exactly what
+    the live run parsed. Does not commit.
+    """
+    digest = content_digest(result.get("content"))
+    exists = conn.execute(
+        "SELECT 1 FROM page_archive WHERE content_sha256 = ?", (digest,)
+    ).fetchone()
+    if not exists:
+        text = (result.get("text") or "").encode("utf-8")
+        conn.execute(
+            "INSERT INTO page_archive (content_sha256, body_zlib, size_bytes) VALUES (?, ?, ?)",
+            (digest, zlib.compress(text, 6), len(text)),
+        )
+    return digest
+
+
+def archive_page(conn: sqlite3.Connection, url: str, feed_url: str, result: dict) -> str:
+    """Store a fetched listing page and log the fetch for replay; returns the digest."""
+    digest = store_body(conn, result)
+    conn.execute(
+        "INSERT INTO page_fetches (url, feed_url, content_sha256, status_code) VALUES (?, ?, ?, ?)",
+        (url, feed_url, digest, result.get("status")),
+    )
+    return digest
+
+
+def load_page(body_zlib: bytes) -> str:
+    return zlib.decompress(body_zlib).decode("utf-8")
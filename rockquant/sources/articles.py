@@ -0,0 +1,96 @@
+import json
+import sqlite3
+
+from rockquant.sources.archive import store_body
+from rockquant.sources.extract import extract_fields
+from rockquant.sources.fetch import HEADERS, HostPool, fetch_all
+from rockquant.sources.fts import index_bodies
+
+
+def pending_articles(conn: sqlite3.Connection, limit: int, retry_failed: bool = True) -> list:
+    """Documents whose article body has not been fetched yet, oldest first.
+
+    Uses the partial index on body_fetched_at, so the cost follows the backlog
+    of new items rather than the size of source_documents. `retry_failed` also
+    picks up documents whose last attempt ended in a network error, 429 or 5xx.
+    """
+    rows = conn.execute("""
+        SELECT id, url FROM source_documents
+        WHERE body_fetched_at IS NULL
+        ORDER BY id
+        LIMIT ?
+    """, (limit,)).fetchall()
+    if retry_failed and len(rows) < limit:
+        rows += conn.execute("""
+            SELECT id, url FROM source_documents
+            WHERE body_sha256 IS NULL AND body_fetched_at IS NOT NULL
+              AND (body_status IS NULL OR body_status = 429 OR body_status >= 500)
+            ORDER BY id
+            LIMIT ?
+        """, (limit - len(rows),)).fetchall()
+    return rows
+
+
+def fetch_articles(conn: sqlite3.Connection, config: dict) -> dict:
+    """Fetch, archive and extract article pages for documents that lack a body.
+
+    Bodies go to page_archive (zlib, one copy per content digest) and
+    source_documents.body_sha256 points at them; amount_usd and project_names
+    are filled from the article text, which is also indexed in events_fts.
+    Documents the deadline left unattempted stay pending; failed attempts are
+    stamped and, unless retry_failed_articles is false, retried on later runs
+    when transient. Commits once per batch.
+    """
+    limit = int(config.get("max_articles", 200))
+    docs = pending_articles(conn, limit, bool(config.get("retry_failed_articles", True)))
+    if not docs:
+        return {"articles_fetched": 0, "articles_failed": 0, "articles_deferred": 0, "articles_pending": 0}
+
+    rate_limit_s = float(config.get("article_rate_limit_s", config.get("rate_limit_s", 0.25)))
+    with HostPool(rate_per_host=(1.0 / rate_limit_s) if rate_limit_s > 0 else 0,
+                  burst=int(config.get("rate_burst", 1)), headers=HEADERS) as pool:
+        fetched = fetch_all(
+            [url for _, url in docs],
+            pool=pool,
+            max_workers=int(config.get("article_workers", 8)),
+            deadline_s=float(config.get("article_deadline_s", 300)),
+            max_attempts=int(config.get("max_attempts", 3)),
+            backoff_s=float(config.get("backoff_s", 2.0)),
+            connect_timeout_s=float(config.get("connect_timeout_s", 20)),
+            read_timeout_s=float(config.get("read_timeout_s", 120)),
+        )
+
+    ok = failed = deferred = 0
+    texts = {}
+    for doc_id, url in docs:
+        r = fetched[url]
+        if r["attempts"] == 0:
+            # Never requested before the deadline: not a failure, keep it pending.
+            deferred += 1
+            continue
+        if r["error"] or r["status"] is None or r["status"] >= 400:
+            conn.execute("""
+                UPDATE source_documents
+                SET body_status = ?, body_fetched_at = datetime('now')
+                WHERE id = ?
+            """, (r["status"], doc_id))
+            failed += 1
+            continue
+        digest = store_body(conn, r)
+        fields = extract_fields(r["text"])
+        conn.execute("""
+            UPDATE source_documents
+            SET body_sha256 = ?, body_status = ?, body_fetched_at = datetime('now'),
+                amount_usd = ?, project_names = ?
+            WHERE id = ?
+        """, (digest, r["status"], fields["amount_usd"],
+              json.dumps(fields["project_names"]), doc_id))
+        texts[doc_id] = fields["text"]
+        ok += 1
+    index_bodies(conn, texts)
+    conn.commit()
+    remaining = conn.execute(
+        "SELECT COUNT(*) FROM source_documents WHERE body_fetched_at IS NULL"
+    ).fetchone()[0]
+    return {"articles_fetched": ok, "articles_failed": failed, "articles_deferred": deferred,
+            "articles_pending": remaining}
@@ -0,0 +1,61 @@
+import hashlib
+import sqlite3
+
+
+def content_digest(content: bytes) -> str:
+    return hashlib.sha256(content or b"").hexdigest()
+
+
+def load_cache(conn: sqlite3.Connection, urls: list) -> dict:
+    """Return {url: {"etag", "last_modified", "content_sha256"}} for cached urls."""
+    urls = list(dict.fromkeys(u for u in urls if u))
+    if not urls:
+        return {}
+    rows = conn.execute(
+        f"SELECT url, etag, last_modified, content_sha256 FROM fetch_cache "
+        f"WHERE url IN ({','.join('?' * len(urls))})",
+        urls,
+    ).fetchall()
+    return {r[0]: {"etag": r[1], "last_modified": r[2], "content_sha256": r[3]} for r in rows}
+
+
+def conditional_headers(entry: dict | None) -> dict:
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def is_unchanged(result: dict, entry: dict | None) -> bool:
+    """True for a 304, or a 200 whose body digest matches the cached one."""
+    if result.get("status") == 304:
+        return True
+    return bool(entry and entry.get("content_sha256")
+                and entry["content_sha256"] == content_digest(result.get("content")))
+
+
+def store_cache(conn: sqlite3.Connection, url: str, result: dict) -> None:
+    """Record validators for `url`; a 304 only refreshes checked_at."""
+    if result.get("status") == 304:
+        conn.execute("UPDATE fetch_cache SET checked_at = datetime('now') WHERE url = ?", (url,))
+        return
+    headers = {k.lower(): v for k, v in (result.get("headers") or {}).items()}
+    conn.execute("""
+        INSERT INTO fetch_cache (url, etag, last_modified, content_sha256, status_code,
+                                 content_length, fetched_at, checked_at)
+        VALUES (?, ?, ?, ?, ?, ?, datetime('now'), datetime('now'))
+        ON CONFLICT(url) DO UPDATE SET
+          etag = excluded.etag,
+          last_modified = excluded.last_modified,
+          content_sha256 = excluded.content_sha256,
+          status_code = excluded.status_code,
+          content_length = excluded.content_length,
+          fetched_at = CASE WHEN fetch_cache.content_sha256 IS excluded.content_sha256
+                            THEN fetch_cache.fetched_at ELSE excluded.fetched_at END,
+          checked_at = excluded.checked_at
+    """, (url, headers.get("etag"), headers.get("last-modified"),
+          content_digest(result.get("content")), result.get("status"),
+          len(result.get("content") or b"")))
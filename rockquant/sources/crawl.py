@@ -0,0 +1,109 @@
+import sqlite3
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+
+CRAWL_MODES = ("latest", "incremental", "backfill")
+
+NEXT_LINK_SELECTORS = (
+    "a[rel=next]",
+    "li.pager__item--next a[href]",
+    "li.pager-next a[href]",
+    "a.pager__link--next[href]",
+    "a.usa-pagination__next-page[href]",
+)
+
+
+def page_url(list_url: str, page: int) -> str:
+    """Drupal-style listing page URL (`?page=N`, zero-based; page 0 is the bare URL)."""
+    p = urlparse(list_url)
+    query = [(k, v) for k, v in parse_qsl(p.query, keep_blank_values=True) if k != "page"]
+    if page > 0:
+        query.append(("page", str(page)))
+    return urlunparse(p._replace(query=urlencode(query)))
+
+
+def next_page_url(soup, current_url: str) -> str | None:
+    for selector in NEXT_LINK_SELECTORS:
+        a = soup.select_one(selector)
+        if a is not None and a.get("href"):
+            return urljoin(current_url, a["href"].strip())
+    return None
+
+
+def known_keys(conn: sqlite3.Connection, keys: list) -> set:
+    keys = list(dict.fromkeys(keys))
+    known = set()
+    # stay well under SQLITE_MAX_VARIABLE_NUMBER on older builds
+    for i in range(0, len(keys), 500):
+        chunk = keys[i:i + 500]
+        known.update(r[0] for r in conn.execute(
+            f"SELECT canonical_event_key FROM events "
+            f"WHERE canonical_event_key IN ({','.join('?' * len(chunk))})",
+            chunk,
+        ))
+    return known
+
+
+def load_watermarks(conn: sqlite3.Connection) -> dict:
+    rows = conn.execute("""
+        SELECT feed_url, newest_event_key, newest_event_date, resume_url, resume_page, resume_floor
+        FROM feed_watermarks
+    """).fetchall()
+    return {r[0]: {"newest_event_key": r[1], "newest_event_date": r[2],
+                   "resume": r[3] and {"url": r[3], "page": r[4], "floor": r[5]}} for r in rows}
+
+
+def store_watermark(conn: sqlite3.Connection, feed_url: str, newest: dict | None,
+                    pages_crawled: int, items_seen: int, crawl_mode: str,
+                    resume: dict | None = None) -> None:
+    """Advance the feed's high-water mark; an older `newest` never moves it back.
+
+    `resume` ({url, page, floor}) means the crawl stopped before reaching known
+    rows: the mark stays where it is, `newest` is held as pending and the next
+    crawl continues from `resume`. Without it the gap is closed, so any pending
+    item is promoted along with `newest` and the resume point is cleared.
+    """
+    row = conn.execute(
+        "SELECT pending_event_key, pending_event_date FROM feed_watermarks WHERE feed_url = ?",
+        (feed_url,)).fetchone()
+    newest = newest or {}
+    if row and row[1] and (not newest.get("event_date") or row[1] > newest["event_date"]):
+        newest = {"canonical_key": row[0], "event_date": row[1]}
+    if resume:
+        conn.execute("""
+            INSERT INTO feed_watermarks (feed_url, pages_crawled, items_seen, crawl_mode, updated_at,
+                                         resume_url, resume_page, resume_floor,
+                                         pending_event_key, pending_event_date)
+            VALUES (?, ?, ?, ?, datetime('now'), ?, ?, ?, ?, ?)
+            ON CONFLICT(feed_url) DO UPDATE SET
+              pages_crawled = excluded.pages_crawled,
+              items_seen = excluded.items_seen,
+              crawl_mode = excluded.crawl_mode,
+              updated_at = excluded.updated_at,
+              resume_url = excluded.resume_url,
+              resume_page = excluded.resume_page,
+              resume_floor = excluded.resume_floor,
+              pending_event_key = excluded.pending_event_key,
+              pending_event_date = excluded.pending_event_date
+        """, (feed_url, pages_crawled, items_seen, crawl_mode, resume["url"], resume["page"],
+              resume["floor"], newest.get("canonical_key"), newest.get("event_date")))
+        return
+    conn.execute("""
+        INSERT INTO feed_watermarks (feed_url, newest_event_key, newest_event_date,
+                                     pages_crawled, items_seen, crawl_mode, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, datetime('now'))
+        ON CONFLICT(feed_url) DO UPDATE SET
+          newest_event_key = CASE
+            WHEN excluded.newest_event_date IS NOT NULL
+             AND (feed_watermarks.newest_event_date IS NULL
+                  OR excluded.newest_event_date >= feed_watermarks.newest_event_date)
+            THEN excluded.newest_event_key ELSE feed_watermarks.newest_event_key END,
+          newest_event_date = NULLIF(MAX(COALESCE(feed_watermarks.newest_event_date, ''),
+                                         COALESCE(excluded.newest_event_date, '')), ''),
+          pages_crawled = excluded.pages_crawled,
+          items_seen = excluded.items_seen,
+          crawl_mode = excluded.crawl_mode,
+          updated_at = excluded.updated_at,
+          resume_url = NULL, resume_page = NULL, resume_floor = NULL,
+          pending_event_key = NULL, pending_event_date = NULL
+    """, (feed_url, newest.get("canonical_key"), newest.get("event_date"),
+          pages_crawled, items_seen, crawl_mode))
@@ -1,61 +1,77 @@
-import re
+from rockquant.sources.rules import Not, RuleSet, normalize_title
+
+_CLOSE = r"\b(close|closes|closed|finaliz(e|es|ed|ing)|financial\s+close)\b"
+_ANNOUNCE = r"\bannounce(s|d)\b"
+
+# (subtype, alternatives, triggers), first match wins. Each alternative is a tuple
+# of patterns that must all match the lowercased, whitespace-collapsed title;
+# triggers are substrings one of which the title must contain for the rule to apply.
+EDF_RULES = (
+    ("DISBURSEMENT_APPROVED", (
+        (r"\b(approves|approved|disburses|disbursed|releases|released|authorizes|authorized)\b.*\bdisbursement(s)?\b",),
+        (r"\bloan\s+disbursement\b",),
+    ), ("disbursement",)),
+    ("REPAYMENT_RECEIVED", (
+        (r"\b(early\s+voluntary\s+repayment|repayment|repaid|repays|paid\s+off|pays\s+off|prepayment|prepay)\b",),
+    ), ("repa", "paid off", "pays off", "prepay")),
+    ("CONDITIONAL_COMMITMENT_TERMINATED", (
+        (r"\b(terminat(e|es|ed|ion)|withdraw(n|s|al)|cancel(s|led|lation)|rescind(s|ed|ing)|revoke(s|d|tion))\b",),
+    ), ("terminat", "withdraw", "cancel", "rescind", "revoke")),
+    ("DEAL_RESTRUCTURED", (
+        (r"\b(restructur(e|es|ed|ing)|amend(s|ed|ment)|modif(y|ies|ied|ication)|refinanc(e|es|ed|ing))\b",),
+    ), ("restructur", "amend", "modif", "refinanc")),
+    ("DEAL_CLOSED_LOAN_GUARANTEE", (
+        (_CLOSE + r".*\b(loan\s+guarantee|guarantee)\b",),
+    ), ("guarantee",)),
+    ("DEAL_CLOSED_LOAN", (
+        (_CLOSE + r".*\bloan\b", Not("guarantee")),
+    ), ("loan",)),
+    ("CONDITIONAL_COMMITMENT_ANNOUNCED", (
+        (_ANNOUNCE + r".*\bconditional\s+commitment\b",),
+    ), ("conditional commitment",)),
+    ("CONDITIONAL_COMMITMENT_ISSUED", (
+        (r"\b(offer(s|ed)?|issue(s|d)?|make(s|made)?|extend(s|ed)?|provide(s|d)?)\b.*\bconditional\s+commitment\b",),
+    ), ("conditional commitment",)),
+    ("DEAL_ANNOUNCED_GUARANTEE", (
+        (_ANNOUNCE + r".*\bloan\s+guarantee\b",),
+    ), ("loan guarantee",)),
+    ("DEAL_ANNOUNCED", (
+        (_ANNOUNCE + r".*\bloan\b",),
+    ), ("loan",)),
+    ("SOLICITATION_ISSUED", (
+        (r"\bsolicitation\b|\brfp\b|request\s+for\s+proposals",),
+    ), ("solicitation", "rfp", "request for proposals")),
+    ("GUIDANCE_ISSUED", (
+        (r"\bnotice\s+of\s+guidance\b|\bguidance\b",),
+    ), ("guidance",)),
+    ("REPORT_YEAR_IN_REVIEW", (
+        (r"\byear\s+in\s+review\b",),
+    ), ("year in review",)),
+    ("REPORT_PUBLISHED", (
+        (r"\breport\b|\breports\b",),
+    ), ("report",)),
+    ("POLICY_TARGET_ANNOUNCED", (
+        (r"\bdeployment\s+target\b",),
+        (r"\b\d+\s*gw\b.*\b(target|goal)\b",),
+    ), ("deployment target", "gw")),
+    ("FUNDING_ANNOUNCED", (
+        # dollar amounts are case-insensitive; the title is already lowercased
+        (_ANNOUNCE, r"\$\s*[\d\.,]+\s*(billion|million|bn|b|m)\b"),
+    ), ("$",)),
+    ("PROJECTS_ANNOUNCED", (
+        (_ANNOUNCE + r".*\bprojects?\b",),
+    ), ("project",)),
+    ("PROJECT_DECISION", (
+        (r"\bapplauds\b.*\bdecision\b|\bapplauds\b|\bwelcomes\b.*\bdecision\b",),
+    ), ("applauds", "welcomes")),
+)
+
+EDF_RULESET = RuleSet(EDF_RULES, default="EVENT_UNKNOWN", normalize=normalize_title)
 
-def classify_edf_subtype(title: str) -> str:
-    t = re.sub(r"\s+", " ", (title or "").lower()).strip()
-
-    if re.search(r"\b(approves|approved|disburses|disbursed|releases|released|authorizes|authorized)\b.*\bdisbursement(s)?\b", t) \
-       or re.search(r"\bloan\s+disbursement\b", t):
-        return "DISBURSEMENT_APPROVED"
-
-    if re.search(r"\b(early\s+voluntary\s+repayment|repayment|repaid|repays|paid\s+off|pays\s+off|prepayment|prepay)\b", t):
-        return "REPAYMENT_RECEIVED"
-
-    if re.search(r"\b(terminat(e|es|ed|ion)|withdraw(n|s|al)|cancel(s|led|lation)|rescind(s|ed|ing)|revoke(s|d|tion))\b", t):
-        return "CONDITIONAL_COMMITMENT_TERMINATED"
-
-    if re.search(r"\b(restructur(e|es|ed|ing)|amend(s|ed|ment)|modif(y|ies|ied|ication)|refinanc(e|es|ed|ing))\b", t):
-        return "DEAL_RESTRUCTURED"
-
-    if re.search(r"\b(close|closes|closed|finaliz(e|es|ed|ing)|financial\s+close)\b.*\b(loan\s+guarantee|guarantee)\b", t):
-        return "DEAL_CLOSED_LOAN_GUARANTEE"
-
-    if re.search(r"\b(close|closes|closed|finaliz(e|es|ed|ing)|financial\s+close)\b.*\bloan\b", t) and "guarantee" not in t:
-        return "DEAL_CLOSED_LOAN"
-
-    if re.search(r"\bannounce(s|d)\b.*\bconditional\s+commitment\b", t):
-        return "CONDITIONAL_COMMITMENT_ANNOUNCED"
-
-    if re.search(r"\b(offer(s|ed)?|issue(s|d)?|make(s|made)?|extend(s|ed)?|provide(s|d)?)\b.*\bconditional\s+commitment\b", t):
-        return "CONDITIONAL_COMMITMENT_ISSUED"
 
-    if re.search(r"\bannounce(s|d)\b.*\bloan\s+guarantee\b", t):
-        return "DEAL_ANNOUNCED_GUARANTEE"
-
-    if re.search(r"\bannounce(s|d)\b.*\bloan\b", t):
-        return "DEAL_ANNOUNCED"
-
-    if re.search(r"\bsolicitation\b|\brfp\b|request\s+for\s+proposals", t):
-        return "SOLICITATION_ISSUED"
-
-    if re.search(r"\bnotice\s+of\s+guidance\b|\bguidance\b", t):
-        return "GUIDANCE_ISSUED"
-
-    if re.search(r"\byear\s+in\s+review\b", t):
-        return "REPORT_YEAR_IN_REVIEW"
-
-    if re.search(r"\breport\b|\breports\b", t):
-        return "REPORT_PUBLISHED"
-
-    if re.search(r"\bdeployment\s+target\b", t) or re.search(r"\b\d+\s*gw\b.*\b(target|goal)\b", t):
-        return "POLICY_TARGET_ANNOUNCED"
-
-    if re.search(r"\bannounce(s|d)\b", t) and re.search(r"\$\s*[\d\.,]+\s*(billion|million|bn|b|m)\b", title or "", re.I):
-        return "FUNDING_ANNOUNCED"
-
-    if re.search(r"\bannounce(s|d)\b.*\bprojects?\b", t):
-        return "PROJECTS_ANNOUNCED"
+def classify_edf_subtype(title: str) -> str:
+    return EDF_RULESET.classify(title)
 
-    if re.search(r"\bapplauds\b.*\bdecision\b|\bapplauds\b|\bwelcomes\b.*\bdecision\b", t):
-        return "PROJECT_DECISION"
 
-    return "EVENT_UNKNOWN"
+def classify_many(titles) -> list:
+    return EDF_RULESET.classify_many(titles)
@@ -1,210 +1,424 @@
 import hashlib
-import sqlite3
 import time
-import re
-from datetime import datetime
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 
-import requests
-from bs4 import BeautifulSoup
-from .classify import classify_edf_subtype
-from .signals import generate_signals
-from rockquant.sources.fast41.classify import classify_fast41_subtype
-from rockquant.sources.fast41.signals import generate_fast41_signals
+from rockquant.db.connection import connect
+from rockquant.db.migrate import migrate
+from rockquant.sources.archive import archive_page
+from rockquant.sources.articles import fetch_articles
+from rockquant.sources.cache import conditional_headers, is_unchanged, load_cache, store_cache
+from rockquant.sources.crawl import (
+    CRAWL_MODES, known_keys, load_watermarks, page_url, store_watermark,
+)
+from rockquant.sources.fetch import HEADERS, HostPool, fetch_all
+from rockquant.sources.ingest import clear_dirty, ingest_batch, load_dirty
+from rockquant.sources.listing import parse_listing_html
+from rockquant.sources.metrics import RunMetrics, finish_run, profiled
+from rockquant.sources.registry import all_article_prefixes, all_sources, default_source, source_for_feed
+from rockquant.sources.signals import run_signal_engine
+from rockquant.sources.trends import update_trends
 
 BASE = "https://www.energy.gov"
-HEADERS = {"User-Agent": "RockQuant/0.4"}
-
-DATE_RE = re.compile(
-    r"\b(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},\s+\d{4}\b"
-)
 
 
 def classify_subtype_for_feed(title: str, feed_url: str) -> str:
-    netloc = urlparse(feed_url).netloc.lower()
-    if "permitting.gov" in netloc:
-        return classify_fast41_subtype(title)
-    return classify_edf_subtype(title)
+    source = source_for_feed(feed_url) or default_source()
+    return source.classify(title)
 
-def run_pipeline(db_path: str, config: dict) -> dict:
-    feeds = config.get("feeds") or [
-        "https://www.energy.gov/lpo/listings/edf-news",
-        "https://www.energy.gov/lpo/listings/lpo-press-releases",
+def source_entity_for_feed(feed_url: str) -> str:
+    # Canonical source entity id from the registry, else the feed domain
+    source = source_for_feed(feed_url)
+    if source is not None:
+        return source.entity_id
+    return urlparse(feed_url).netloc.lower() or 'UNKNOWN'
+
+
+def normalize_feeds(feeds: list) -> list:
+    """Feeds may be URL strings or {"name", "list_url"|"url"} dicts -> [(name, url)]."""
+    feed_urls = []
+    for f in feeds:
+        if isinstance(f, str):
+            feed_urls.append((urlparse(f).path.split("/")[-1], f))
+        elif isinstance(f, dict):
+            feed_urls.append((f.get("name", "unknown"), f.get("list_url") or f.get("url")))
+    return [(name, url) for name, url in feed_urls if url]
+
+
+def canonical_event_key(article_url: str) -> str:
+    # canonical key = sha256("doe|" + normalized path)
+    p = urlparse(article_url)
+    url_path = (p.path.rstrip("/").lower() or "/")
+    return hashlib.sha256(f"doe|{url_path}".encode("utf-8")).hexdigest()
+
+
+def listing_items(page_items: list) -> list:
+    """ListingItems -> the dicts ingest_batch takes, keyed by canonical event key."""
+    return [
+        {"url": li.url, "title": li.title, "event_date": li.event_date,
+         "canonical_key": canonical_event_key(li.url), "raw_html": li.raw_html}
+        for li in page_items
     ]
-    max_items = int(config.get("max_items_per_page", 10))
+
+
+def classify_items(items: list, feed_url: str, source_entity_id: str) -> list:
+    source = source_for_feed(feed_url) or default_source()
+    subtypes = source.classify_titles([item["title"] for item in items])
+    for item, subtype in zip(items, subtypes):
+        item["event_subtype"] = subtype
+        item["source_entity_id"] = source_entity_id
+    return items
+
+
+def host_pool(config: dict, share: float = 1.0) -> HostPool:
+    """HostPool for `config`; `share` scales the per-host rate (for processes sharing a host)."""
     rate_limit_s = float(config.get("rate_limit_s", 0.25))
+    return HostPool(
+        rate_per_host=(share / rate_limit_s) if rate_limit_s > 0 else 0,
+        burst=int(config.get("rate_burst", 1)),
+        headers=HEADERS,
+    )
+
 
-    conn = sqlite3.connect(db_path, timeout=60)
+def fetch_feeds(feed_urls: list, config: dict, pool: HostPool | None = None, headers_for=None,
+                deadline_s: float | None = None) -> dict:
+    """Concurrent fetch stage: one pooled session and token bucket per host, one deadline.
+
+    `deadline_s` defaults to config deadline_s; crawl_feeds passes what is left
+    of the run's deadline.
+    """
+    own_pool = pool is None
+    pool = pool or host_pool(config)
     try:
-        conn.execute("PRAGMA foreign_keys = ON")
-        conn.execute("PRAGMA busy_timeout = 5000")
-        try:
-            conn.execute("PRAGMA journal_mode = WAL")
-        except sqlite3.OperationalError:
-            pass
-
-        cur = conn.cursor()
-        # Ensure events.source_entity_id exists (idempotent, SQLite-safe)
-        cols = [r[1] for r in cur.execute('PRAGMA table_info(events)').fetchall()]
-        if 'source_entity_id' not in cols:
-            cur.execute('ALTER TABLE events ADD COLUMN source_entity_id TEXT')
-            conn.commit()
+        return fetch_all(
+            feed_urls,
+            pool=pool,
+            max_workers=int(config.get("max_workers", 8)),
+            deadline_s=float(config.get("deadline_s", 180)) if deadline_s is None else deadline_s,
+            headers_for=headers_for,
+            max_attempts=int(config.get("max_attempts", 3)),
+            backoff_s=float(config.get("backoff_s", 2.0)),
+            connect_timeout_s=float(config.get("connect_timeout_s", 20)),
+            read_timeout_s=float(config.get("read_timeout_s", 120)),
+        )
+    finally:
+        if own_pool:
+            pool.close()
 
-        items_parsed = 0
-        new_events = 0
-        skipped_no_link = 0
-        skipped_no_date = 0
-
-        # normalize feeds (strings or dicts)
-        feed_urls = []
-        for f in feeds:
-            # Canonical source entity id by feed domain
-            parsed_feed = urlparse(f)
-            if 'permitting.gov' in parsed_feed.netloc.lower():
-                source_entity_id = 'FAST41_COUN'
-            elif 'energy.gov' in parsed_feed.netloc.lower() and '/lpo/' in f:
-                source_entity_id = 'DOE_LPO'
-            else:
-                source_entity_id = parsed_feed.netloc.lower() or 'UNKNOWN'
-            if isinstance(f, str):
-                feed_urls.append((urlparse(f).path.split("/")[-1], f))
-            elif isinstance(f, dict):
-                feed_urls.append((f.get("name", "unknown"), f.get("list_url") or f.get("url")))
-
-        for feed_name, feed_url in feed_urls:
-            if not feed_url:
-                continue
 
-            last_err = None
-            for attempt in range(1, 4):
-                try:
-                    # Increased timeouts: (connect, read)
-                    last_err = None
-                    for attempt in range(1, 4):
-                        try:
-                            # Increased timeouts: (connect, read)
-                            r = requests.get(feed_url, headers=HEADERS, timeout=(20, 120))
-                            break
-                        except (requests.exceptions.Timeout, requests.exceptions.SSLError, requests.exceptions.ConnectionError) as e:
-                            last_err = e
-                            if attempt == 3:
-                                raise
-                            time.sleep(2 * attempt)
-                    break
-                except (requests.exceptions.Timeout, requests.exceptions.SSLError, requests.exceptions.ConnectionError) as e:
-                    last_err = e
-                    if attempt == 3:
-                        raise
-                    time.sleep(2 * attempt)
-            print(f"[fetch] {feed_url}\n  status={r.status_code} bytes={len(r.content)}", flush=True)
-            r.raise_for_status()
-
-            soup = BeautifulSoup(r.text, "html.parser")
-            rows = soup.select("div.views-row")[:max_items]
-            print(f"  parsed_items={len(rows)}", flush=True)
-
-            for row in rows:
-                # strict article link selection
-                article_href = None
-                title = None
-                for a in row.find_all("a", href=True):
-                    href = a["href"].strip()
-                    # Accept DOE LPO article paths and Permitting Council press-release paths
-                    if href.startswith(("/articles/", "/lpo/articles/", "/newsroom/press-releases/")):
-                        # Avoid capturing the listing page itself
-                        if href.rstrip("/") == "/newsroom/press-releases":
-                            continue
-                        article_href = href
-                        title = a.get_text(" ", strip=True)
-                        break
-
-                if not article_href:
-                    skipped_no_link += 1
-                    continue
-
-                parsed_feed = urlparse(f)
-                _base = f"{parsed_feed.scheme}://{parsed_feed.netloc}"
-                article_url = article_href if article_href.startswith("http") else urljoin(_base, article_href)
-                title = (title or "").strip() or article_url
-
-                # exact date from row strings
-                date_str = None
-                for s in row.stripped_strings:
-                    m = DATE_RE.search(s)
-                    if m:
-                        date_str = m.group(0)
-                        break
-                if not date_str:
-                    skipped_no_date += 1
-                    continue
-
-                try:
-                    event_date = datetime.strptime(date_str, "%B %d, %Y").strftime("%Y-%m-%d")
-                except ValueError:
-                    skipped_no_date += 1
-                    continue
-
-                items_parsed += 1
-
-                # upsert source_documents by article_url
-                cur.execute("""
-                    INSERT INTO source_documents (url, published_date, fetched_at)
-                    VALUES (?, ?, datetime('now'))
-                    ON CONFLICT(url) DO UPDATE SET
-                      published_date = excluded.published_date,
-                      fetched_at = excluded.fetched_at
-                """, (article_url, event_date))
-
-                source_doc_id = cur.execute(
-                    "SELECT id FROM source_documents WHERE url = ?",
-                    (article_url,)
-                ).fetchone()[0]
-
-                # canonical key = sha256("doe|" + normalized path)
-                p = urlparse(article_url)
-                url_path = (p.path.rstrip("/").lower() or "/")
-                canonical_key = hashlib.sha256(f"doe|{url_path}".encode("utf-8")).hexdigest()
-
-                existed = cur.execute(
-                    "SELECT 1 FROM events WHERE canonical_event_key = ?",
-                    (canonical_key,)
-                ).fetchone()
-
-                cur.execute("""
-                    INSERT INTO events (
-                      canonical_event_key, event_date, title, url,
-                      event_type, event_subtype, source_doc_id, source_entity_id
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    ON CONFLICT(canonical_event_key) DO UPDATE SET
-                      title = excluded.title,
-                      event_date = excluded.event_date,
-                      url = excluded.url,
-                source_entity_id = excluded.source_entity_id,
-                                          event_subtype = excluded.event_subtype
-            """, (canonical_key, event_date, title, article_url, "news", classify_subtype_for_feed(title, feed_url), source_doc_id, source_entity_id))
-                if not existed:
-                    new_events += 1
-
-                time.sleep(rate_limit_s)
-
-        conn.commit()
-        total_events = cur.execute("SELECT COUNT(*) FROM events").fetchone()[0]
-        print(
-            f"  skipped: no_article_link={skipped_no_link}, no_date={skipped_no_date}",
-            flush=True,
+class DirectSink:
+    """Writes each crawled page on `conn` in its own transaction."""
+
+    stage = "write"  # metrics stage crawl_feeds times sink.page() under
+
+    def __init__(self, conn, archive_pages: bool = True, metrics: RunMetrics | None = None):
+        self.conn = conn
+        self.archive_pages = archive_pages
+        self.metrics = metrics or RunMetrics()
+
+    def unchanged(self, url: str, result: dict) -> None:
+        self.metrics.begin_write(self.conn)
+        store_cache(self.conn, url, result)
+        self.conn.commit()
+
+    def page(self, url: str, feed_url: str, result: dict, items: list) -> dict:
+        self.metrics.begin_write(self.conn)
+        if self.archive_pages:
+            archive_page(self.conn, url, feed_url, result)
+        written = ingest_batch(self.conn, items)
+        # Validators are committed with the rows they describe, so a crash
+        # mid-feed never leaves a page marked as already ingested.
+        store_cache(self.conn, url, result)
+        self.conn.commit()
+        return written
+
+    def watermark(self, feed_url: str, newest: dict | None, pages: int, items: int, crawl_mode: str,
+                  resume: dict | None = None) -> None:
+        self.metrics.begin_write(self.conn)
+        store_watermark(self.conn, feed_url, newest, pages, items, crawl_mode, resume)
+        self.conn.commit()
+
+
+def crawl_feeds(conn, feed_urls: list, config: dict, pool: HostPool, sink,
+                metrics: RunMetrics | None = None) -> dict:
+    """Fetch, parse and classify listing pages of `feed_urls`, following pagination.
+
+    `conn` is only read (fetch cache, known keys, feed watermarks); every write
+    goes through `sink` (DirectSink, or a queue to a single writer process in
+    rockquant.sources.runner). sink.page() may return ingest counts or None.
+    Per-feed fetch/parse/classify/write latency, bytes and retries go to `metrics`.
+
+    crawl_mode:
+      "latest"      - first page only, truncated to max_items_per_page (legacy behaviour)
+      "incremental" - follow pagination until a page holds only known canonical keys
+                      or the feed's stored high-water mark (default)
+      "backfill"    - walk every page, `backfill_concurrency` pages per feed at a time
+
+    deadline_s bounds the whole crawl, every pagination round included. A feed
+    that stops on an error, the deadline or max_pages before reaching known rows
+    keeps a resume point in feed_watermarks; the next crawl that would stop
+    early (304, only known keys, the high-water mark) jumps there instead, and
+    no page of known rows ends the crawl until it has passed the deepest
+    interrupted page and seen new rows again.
+    """
+    metrics = metrics or RunMetrics()
+    max_items = int(config.get("max_items_per_page", 10))
+    crawl_mode = config.get("crawl_mode", "incremental")
+    if crawl_mode not in CRAWL_MODES:
+        raise ValueError(f"crawl_mode must be one of {CRAWL_MODES}, got {crawl_mode!r}")
+    max_pages = int(config.get("max_pages", 0 if crawl_mode == "backfill" else 50))
+    backfill_concurrency = max(1, int(config.get("backfill_concurrency", 4)))
+    # A backfill must see every page (and its pager), so it never sends validators.
+    use_cache = (bool(config.get("use_cache", True)) and not config.get("force_refresh")
+                 and crawl_mode != "backfill")
+
+    stats = {
+        "items_parsed": 0, "pages_fetched": 0, "pages_ingested": 0,
+        "new_events": 0, "updated_events": 0,
+        "skipped_no_link": 0, "skipped_no_date": 0,
+        "feeds_unchanged": 0, "feed_errors": [],
+    }
+    feed_errors = stats["feed_errors"]
+    article_prefixes = all_article_prefixes()
+    watermarks = load_watermarks(conn)
+    states = []
+    for name, url in feed_urls:
+        resume = (watermarks.get(url) or {}).get("resume")
+        states.append({"name": name, "url": url, "entity": source_entity_for_feed(url),
+                       "pages": 0, "items": 0, "newest": None, "done": False, "queued_through": 0,
+                       # resume point of an interrupted crawl; armed once it is closed
+                       "resume": resume, "jumped": False, "armed": resume is None, "stop": None})
+
+    def stop_at(st, page_no, url):
+        # shallowest page this run left unfetched or unparsed
+        if crawl_mode != "latest" and (st["stop"] is None or page_no < st["stop"][0]):
+            st["stop"] = (page_no, url)
+
+    def jump(st, page_no, next_frontier) -> bool:
+        if st["jumped"] or st["resume"]["page"] <= page_no:
+            return False
+        st["jumped"] = True
+        next_frontier.append((st, st["resume"]["page"], st["resume"]["url"]))
+        return True
+
+    frontier = [(st, 0, st["url"]) for st in states]
+    deadline = time.monotonic() + float(config.get("deadline_s", 180))
+
+    while frontier:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            for st, page_no, url in frontier:
+                if not st["done"]:
+                    stop_at(st, page_no, url)
+            for st in {id(st): st for st, _, _ in frontier if not st["done"]}.values():
+                feed_errors.append({"feed": st["name"], "url": st["url"],
+                                    "error": f"deadline exceeded after {st['pages']} pages"})
+            break
+        # Pages past a resume point are read in full: a 304 there says nothing
+        # about whether their rows were ever ingested.
+        page_urls = [u for _, _, u in frontier]
+        cache = load_cache(conn, [u for st, _, u in frontier if not st["jumped"]]) if use_cache else {}
+        fetched = fetch_feeds(
+            page_urls, config, pool=pool,
+            headers_for=lambda u: conditional_headers(cache.get(u)),
+            deadline_s=remaining,
         )
+        next_frontier = []
+
+        for st, page_no, url in frontier:
+            if st["done"]:
+                continue
+            r = fetched[url]
+            stats["pages_fetched"] += 1
+            metrics.observe("fetch", r["elapsed_s"], st["name"])
+            metrics.add("bytes", len(r["content"]), feed=st["name"])
+            metrics.add("retries", max(0, r["attempts"] - 1), feed=st["name"])
+            print(f"[fetch] {url}\n  status={r['status']} bytes={len(r['content'])} "
+                  f"attempts={r['attempts']} elapsed={r['elapsed_s']:.2f}s", flush=True)
+            if r["error"] or r["status"] is None or r["status"] >= 400:
+                feed_errors.append({"feed": st["name"], "url": url,
+                                    "error": r["error"] or f"HTTP {r['status']}"})
+                stop_at(st, page_no, url)
+                st["done"] = True
+                continue
+            if use_cache and not st["jumped"] and is_unchanged(r, cache.get(url)):
+                # 304 or identical body: its rows were ingested when it last changed
+                print("  unchanged (cached)", flush=True)
+                sink.unchanged(url, r)
+                if page_no == 0:
+                    stats["feeds_unchanged"] += 1
+                if st["armed"] or not jump(st, page_no, next_frontier):
+                    st["done"] = True
+                continue
+
+            with metrics.timed("parse", st["name"]):
+                page = parse_listing_html(
+                    r["text"], st["url"], article_prefixes,
+                    max_items=max_items if crawl_mode == "latest" else None,
+                    backend=config.get("parser_backend"))
+                items = listing_items(page.items)
+            metrics.add("rows", len(items), "parse", st["name"])
+            print(f"  parsed_items={len(items)}", flush=True)
+            stats["skipped_no_link"] += page.skipped_no_link
+            stats["skipped_no_date"] += page.skipped_no_date
+            stats["items_parsed"] += len(items)
+
+            keys = [it["canonical_key"] for it in items]
+            known = known_keys(conn, keys) if crawl_mode == "incremental" else set()
+            mark = (watermarks.get(st["url"]) or {}).get("newest_event_key")
+
+            with metrics.timed("classify", st["name"]):
+                classified = classify_items(items, st["url"], st["entity"])
+            metrics.add("rows", len(items), "classify", st["name"])
+            with metrics.timed(sink.stage, st["name"]):
+                written = sink.page(url, st["url"], r, classified)
+            if written is not None:
+                metrics.add("rows", len(items), "write", st["name"])
+                stats["new_events"] += written["inserted"]
+                stats["updated_events"] += written["updated"]
+            stats["pages_ingested"] += 1
+
+            st["pages"] += 1
+            st["items"] += len(items)
+            if items:
+                top = max(items, key=lambda it: it["event_date"])
+                if st["newest"] is None or top["event_date"] > st["newest"]["event_date"]:
+                    st["newest"] = top
+
+            if not st["armed"] and page_no >= st["resume"]["floor"] and len(known) < len(set(keys)):
+                st["armed"] = True  # past the interrupted pages and into new rows again
+
+            nxt = page.next_url
+            at_cap = max_pages and st["pages"] >= max_pages
+            if crawl_mode == "latest" or not items or not nxt:
+                st["done"] = True
+                st["armed"] = True  # end of the listing: nothing left to resume
+            elif at_cap:
+                stop_at(st, page_no + 1, nxt)
+                st["done"] = True
+            elif crawl_mode == "incremental":
+                if len(known) == len(set(keys)) or (mark and mark in keys):
+                    if st["armed"]:
+                        st["done"] = True
+                    elif not jump(st, page_no, next_frontier):
+                        next_frontier.append((st, page_no + 1, nxt))
+                else:
+                    next_frontier.append((st, page_no + 1, nxt))
+            elif page_no >= st["queued_through"]:
+                # backfill: queue the next window of pages once this window is consumed
+                last = page_no + backfill_concurrency
+                if max_pages:
+                    last = min(last, max_pages - 1)
+                next_frontier.append((st, page_no + 1, nxt))
+                next_frontier.extend(
+                    (st, n, page_url(st["url"], n)) for n in range(page_no + 2, last + 1))
+                st["queued_through"] = last
+
+        frontier = next_frontier
 
-        # Generate signals from events
-        signal_result = generate_signals(db_path)
-        fast41_signal_result = generate_fast41_signals(db_path)
-        signals_count = int(signal_result.get('signals', 0)) + int(fast41_signal_result.get('signals', 0))
-
-        return {
-            "status": "ok",
-            "items_parsed": items_parsed,
-            "events": total_events,
-            "new_events": new_events,
-            "signals": signals_count,
-        }
+    for st in states:
+        if st["pages"]:
+            newest = st["newest"] and {k: st["newest"][k] for k in ("canonical_key", "event_date")}
+            resume = None if st["armed"] else st["resume"]
+            if st["stop"]:
+                floor = max(st["stop"][0], (st["resume"] or {}).get("floor") or 0)
+                resume = {"url": st["stop"][1], "page": st["stop"][0], "floor": floor}
+            sink.watermark(st["url"], newest, st["pages"], st["items"], crawl_mode, resume)
+    return stats
+
+
+def post_ingest(conn, config: dict, dirty: set, dirty_high: int, metrics: RunMetrics | None = None) -> dict:
+    """Signals for the dirty buckets, rolling trends and (optionally) article bodies."""
+    metrics = metrics or RunMetrics()
+    # Generate signals for the (date, source) buckets ingestion touched;
+    # full_signal_rebuild recomputes everything from events instead.
+    signals_count = 0
+    if dirty or config.get("full_signal_rebuild"):
+        scope = None if config.get("full_signal_rebuild") else dirty
+        # one pass over events for every registered source
+        with metrics.timed("signals"):
+            metrics.begin_write(conn)
+            signals_count = int(run_signal_engine(conn, dirty=scope).get('signals', 0))
+            clear_dirty(conn, dirty_high)
+            conn.commit()
+        metrics.add("rows", signals_count, "signals")
+
+    # Rolling trends from the earliest date whose signals may have changed
+    trend_result = {}
+    if config.get("update_trends", True):
+        since = min((d for d, _ in dirty if d), default=None)
+        with metrics.timed("trends"):
+            metrics.begin_write(conn)
+            trend_result = update_trends(conn, since=since, full=bool(config.get("full_signal_rebuild")))
+            conn.commit()
+        metrics.add("rows", trend_result.get("trend_rows", 0), "trends")
+
+    # Optional detail stage: bodies for articles not fetched yet
+    article_result = {}
+    if config.get("fetch_articles"):
+        with metrics.timed("articles"):
+            article_result = fetch_articles(conn, config)
+        metrics.add("rows", article_result["articles_fetched"], "articles")
+        print(f"  articles: fetched={article_result['articles_fetched']} "
+              f"failed={article_result['articles_failed']} "
+              f"deferred={article_result['articles_deferred']} "
+              f"pending={article_result['articles_pending']}", flush=True)
+    return {"signals": signals_count, **trend_result, **article_result}
+
+
+def pipeline_result(stats: dict, crawl_mode: str, total_events: int, post: dict) -> dict:
+    print(
+        f"  skipped: no_article_link={stats['skipped_no_link']}, no_date={stats['skipped_no_date']}",
+        flush=True,
+    )
+    for err in stats["feed_errors"]:
+        print(f"  [error] {err['url']}: {err['error']}", flush=True)
+    return {
+        "status": "partial" if stats["feed_errors"] else "ok",
+        "crawl_mode": crawl_mode,
+        "items_parsed": stats["items_parsed"],
+        "pages_fetched": stats["pages_fetched"],
+        "pages_ingested": stats["pages_ingested"],
+        "events": total_events,
+        "new_events": stats["new_events"],
+        "updated_events": stats["updated_events"],
+        "signals": post.pop("signals"),
+        **{k: post.pop(k) for k in ("trend_rows", "trends_from") if k in post},
+        "feeds_unchanged": stats["feeds_unchanged"],
+        "feed_errors": stats["feed_errors"],
+        **post,
+    }
+
+
+def run_pipeline(db_path: str, config: dict) -> dict:
+    """Crawl listing feeds into `events`, then regenerate signals.
+
+    See crawl_feeds for crawl_mode. For several feeds or configs at once on
+    multiple cores, see rockquant.sources.runner.run_sharded.
+
+    Each run's stage/feed metrics (rockquant.sources.metrics) are stored in
+    pipeline_runs unless record_run is false, and the result carries run_id,
+    duration_s and per-stage `timings`. `metrics_prometheus` also writes them
+    as a Prometheus textfile; `profile` writes a cProfile dump of the run.
+    """
+    feeds = config.get("feeds") or [url for src in all_sources() for url in src.feeds]
+    crawl_mode = config.get("crawl_mode", "incremental")
+    if crawl_mode not in CRAWL_MODES:
+        raise ValueError(f"crawl_mode must be one of {CRAWL_MODES}, got {crawl_mode!r}")
+
+    migrate(db_path)
+    conn = connect(db_path)
+    pool = host_pool(config)
+    metrics = RunMetrics()
+    try:
+        with profiled(config.get("profile")):
+            conn.execute("PRAGMA foreign_keys = ON")
+            sink = DirectSink(conn, bool(config.get("archive_pages", True)), metrics)
+            stats = crawl_feeds(conn, normalize_feeds(feeds), config, pool, sink, metrics)
+            total_events = conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+            dirty, dirty_high = load_dirty(conn)
+            post = post_ingest(conn, config, dirty, dirty_high, metrics)
+            result = pipeline_result(stats, crawl_mode, total_events, post)
+        return finish_run(conn, metrics, result, config)
     finally:
+        pool.close()
         conn.close()
@@ -0,0 +1,60 @@
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Article body containers on energy.gov / permitting.gov (Drupal) pages.
+BODY_STRAINER = SoupStrainer(["article", "main"])
+
+AMOUNT_RE = re.compile(
+    r"\$\s*(\d{1,3}(?:,\d{3})+|\d+(?:\.\d+)?)\s*(trillion|billion|million|thousand|bn|b|m|k)?\b",
+    re.I,
+)
+SCALE = {
+    "trillion": 1e12, "billion": 1e9, "bn": 1e9, "b": 1e9,
+    "million": 1e6, "m": 1e6, "thousand": 1e3, "k": 1e3,
+}
+PROJECT_RE = re.compile(
+    r"\b((?:[A-Z][\w&'.-]*\s+){1,6}(?:Project|Facility|Plant|Mine|Refinery|Center|Complex|Park))\b"
+)
+_LEADING_NOISE = re.compile(r"^(?:The|A|An|This|That|For|In|At|Of|To|And)\s+")
+
+
+def article_text(html: str) -> str:
+    """Whitespace-collapsed text of the article body (the whole page as a fallback)."""
+    soup = BeautifulSoup(html, "html.parser", parse_only=BODY_STRAINER)
+    node = soup.find("article") or soup.find("main")
+    if node is None:
+        node = BeautifulSoup(html, "html.parser").body
+    if node is None:
+        return ""
+    return " ".join(node.get_text(" ", strip=True).split())
+
+
+def dollar_amounts(text: str) -> list:
+    out = []
+    for m in AMOUNT_RE.finditer(text):
+        value = float(m.group(1).replace(",", ""))
+        out.append(value * SCALE.get((m.group(2) or "").lower(), 1.0))
+    return out
+
+
+def project_names(text: str, limit: int = 10) -> list:
+    names = []
+    for m in PROJECT_RE.finditer(text):
+        name = _LEADING_NOISE.sub("", m.group(1).strip())
+        if " " in name and name not in names:
+            names.append(name)
+        if len(names) >= limit:
+            break
+    return names
+
+
+def extract_fields(html: str) -> dict:
+    text = article_text(html)
+    amounts = dollar_amounts(text)
+    return {
+        "text": text,
+        "amounts_usd": amounts,
+        "amount_usd": max(amounts) if amounts else None,
+        "project_names": project_names(text),
+    }
@@ -1,22 +1,40 @@
 from __future__ import annotations
 
-def classify_fast41_subtype(title: str) -> str:
-    t = (title or "").strip().lower()
+import re
+
+from rockquant.sources.rules import RuleSet, strip_lower
+
 
-    # Common patterns in permitting.gov press releases
-    if "fast-41" in t and ("adds" in t or "added" in t or "latest to gain" in t or "gain fast-41" in t):
-        return "FAST41_ADDED"
+def _any(*phrases: str) -> str:
+    return "|".join(re.escape(p) for p in phrases)
 
-    if "milestone" in t:
-        return "MILESTONE_UPDATE"
 
-    if "significant progress" in t or "progress achieved" in t:
-        return "PROGRESS_UPDATE"
+# Common patterns in permitting.gov press releases: substring matches on the
+# lowercased title, first match wins. See rockquant.sources.rules.RuleSet.
+FAST41_RULES = (
+    ("FAST41_ADDED", (
+        (_any("fast-41"), _any("adds", "added", "latest to gain", "gain fast-41")),
+    ), ("fast-41",)),
+    ("MILESTONE_UPDATE", (
+        (_any("milestone"),),
+    ), ("milestone",)),
+    ("PROGRESS_UPDATE", (
+        (_any("significant progress", "progress achieved"),),
+    ), ("significant progress", "progress achieved")),
+    ("PERMITTING_APPROVAL", (
+        (_any("federal permitting approval", "completes federal permitting"),),
+    ), ("federal permitting approval", "completes federal permitting")),
+    ("SITE_VISIT", (
+        (_any("executive director tours", "tours"),),
+    ), ("tours",)),
+)
 
-    if "federal permitting approval" in t or "completes federal permitting" in t:
-        return "PERMITTING_APPROVAL"
+FAST41_RULESET = RuleSet(FAST41_RULES, default="FAST41_NEWS", normalize=strip_lower)
+
+
+def classify_fast41_subtype(title: str) -> str:
+    return FAST41_RULESET.classify(title)
 
-    if "executive director tours" in t or "tours" in t:
-        return "SITE_VISIT"
 
-    return "FAST41_NEWS"
+def classify_many(titles) -> list:
+    return FAST41_RULESET.classify_many(titles)
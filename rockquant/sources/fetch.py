@@ -0,0 +1,177 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+HEADERS = {"User-Agent": "RockQuant/0.4"}
+
+RETRY_EXCEPTIONS = (
+    requests.exceptions.Timeout,
+    requests.exceptions.SSLError,
+    requests.exceptions.ConnectionError,
+)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `burst` banked."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, deadline: float | None = None) -> bool:
+        if self.rate <= 0:
+            return True
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return True
+                wait_s = (1.0 - self.tokens) / self.rate
+            if deadline is not None and time.monotonic() + wait_s > deadline:
+                return False
+            time.sleep(wait_s)
+
+
+class HostPool:
+    """One pooled `requests.Session` and one rate limiter per host."""
+
+    def __init__(self, rate_per_host: float = 4.0, burst: int = 1, pool_size: int = 4,
+                 headers: dict | None = None):
+        self.rate_per_host = rate_per_host
+        self.burst = burst
+        self.pool_size = pool_size
+        self.headers = dict(headers or HEADERS)
+        self.sessions = {}
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def _host(self, url: str) -> str:
+        p = urlparse(url)
+        return f"{p.scheme}://{p.netloc}".lower()
+
+    def session(self, url: str) -> requests.Session:
+        host = self._host(url)
+        with self.lock:
+            s = self.sessions.get(host)
+            if s is None:
+                s = requests.Session()
+                s.headers.update(self.headers)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                s.mount("http://", adapter)
+                s.mount("https://", adapter)
+                self.sessions[host] = s
+            return s
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = self._host(url)
+        with self.lock:
+            b = self.buckets.get(host)
+            if b is None:
+                b = TokenBucket(self.rate_per_host, self.burst)
+                self.buckets[host] = b
+            return b
+
+    def close(self) -> None:
+        with self.lock:
+            for s in self.sessions.values():
+                s.close()
+            self.sessions.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _failed(url: str, error: str, elapsed_s: float = 0.0) -> dict:
+    return {"url": url, "status": None, "content": b"", "text": "", "headers": {},
+            "attempts": 0, "elapsed_s": elapsed_s, "error": error}
+
+
+def fetch_one(pool: HostPool, url: str, deadline: float, headers: dict | None = None,
+              max_attempts: int = 3, backoff_s: float = 1.0,
+              connect_timeout_s: float = 10.0, read_timeout_s: float = 60.0) -> dict:
+    """GET `url` with bounded retries/backoff, never running past `deadline` (monotonic)."""
+    result = _failed(url, None)
+    started = time.monotonic()
+    session = pool.session(url)
+    bucket = pool.bucket(url)
+
+    for attempt in range(1, max_attempts + 1):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not bucket.acquire(deadline):
+            result["error"] = result["error"] or "deadline exceeded"
+            break
+        remaining = deadline - time.monotonic()
+        result["attempts"] = attempt
+        try:
+            r = session.get(url, headers=headers,
+                            timeout=(min(connect_timeout_s, remaining), min(read_timeout_s, remaining)))
+        except RETRY_EXCEPTIONS as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        else:
+            result.update(status=r.status_code, content=r.content, text=r.text,
+                          headers=dict(r.headers), error=None)
+            if r.status_code not in RETRY_STATUS:
+                break
+            result["error"] = f"HTTP {r.status_code}"
+        if attempt < max_attempts:
+            pause = backoff_s * (2 ** (attempt - 1))
+            if time.monotonic() + pause >= deadline:
+                break
+            time.sleep(pause)
+
+    result["elapsed_s"] = time.monotonic() - started
+    return result
+
+
+def fetch_all(urls: list, pool: HostPool | None = None, max_workers: int = 8,
+              deadline_s: float = 180.0, headers_for=None, **fetch_kwargs) -> dict:
+    """Fetch `urls` concurrently; returns {url: result} in input order.
+
+    Hosts proceed independently (each throttled by its own bucket), so wall-clock
+    time is bounded by the slowest host and by `deadline_s` overall.
+    `headers_for(url)` may supply per-request headers.
+    """
+    urls = list(dict.fromkeys(u for u in urls if u))
+    if not urls:
+        return {}
+    own_pool = pool is None
+    pool = pool or HostPool()
+    deadline = time.monotonic() + deadline_s
+    results = {}
+    ex = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls))))
+    try:
+        futures = {
+            ex.submit(fetch_one, pool, u, deadline,
+                      headers_for(u) if headers_for else None, **fetch_kwargs): u
+            for u in urls
+        }
+        # Per-request timeouts are clipped to the deadline; the grace second
+        # lets in-flight requests report their own timeout before we give up.
+        done, _ = wait(futures, timeout=max(0.0, deadline - time.monotonic()) + 1.0)
+        for fut, u in futures.items():
+            if fut not in done:
+                results[u] = _failed(u, "deadline exceeded", deadline_s)
+                continue
+            try:
+                results[u] = fut.result()
+            except Exception as e:
+                results[u] = _failed(u, f"{type(e).__name__}: {e}")
+    finally:
+        ex.shutdown(wait=False, cancel_futures=True)
+        if own_pool:
+            pool.close()
+    return {u: results[u] for u in urls}
@@ -0,0 +1,41 @@
+import sqlite3
+
+from rockquant.sources.archive import load_page
+from rockquant.sources.extract import article_text
+
+
+def index_bodies(conn: sqlite3.Connection, doc_texts: dict) -> None:
+    """Set the events_fts body of every event of each source document.
+
+    `doc_texts` maps source_documents.id to article text. Titles are synced by
+    triggers; bodies are only known once the article is fetched, so
+    fetch_articles calls this in the same transaction. Does not commit.
+    """
+    conn.executemany(
+        "UPDATE events_fts SET body = ? WHERE rowid IN (SELECT id FROM events WHERE source_doc_id = ?)",
+        [(text, doc_id) for doc_id, text in doc_texts.items()],
+    )
+
+
+def reindex_bodies(conn: sqlite3.Connection, batch: int = 200) -> int:
+    """Re-extract archived article bodies into events_fts; returns documents indexed.
+
+    For events re-created without their body (e.g. a replay --rebuild). Reads
+    bodies from page_archive, so it needs no network. Does not commit.
+    """
+    done = 0
+    last_id = 0
+    while True:
+        rows = conn.execute("""
+            SELECT d.id, a.body_zlib
+            FROM source_documents d
+            JOIN page_archive a ON a.content_sha256 = d.body_sha256
+            WHERE d.id > ? AND EXISTS (SELECT 1 FROM events e WHERE e.source_doc_id = d.id)
+            ORDER BY d.id
+            LIMIT ?
+        """, (last_id, batch)).fetchall()
+        if not rows:
+            return done
+        last_id = rows[-1][0]
+        index_bodies(conn, {doc_id: article_text(load_page(body)) for doc_id, body in rows})
+        done += len(rows)
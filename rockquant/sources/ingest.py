@@ -0,0 +1,120 @@
+import sqlite3
+
+# Keep each multi-row statement under the 999 bound-parameter limit of older SQLite builds.
+MAX_VARIABLES = 999
+
+SOURCE_DOC_COLS = ("url", "published_date", "raw_html")
+EVENT_COLS = (
+    "canonical_event_key", "event_date", "title", "url",
+    "event_type", "event_subtype", "source_doc_id", "source_entity_id",
+)
+
+
+def _chunks(rows: list, ncols: int):
+    size = max(1, MAX_VARIABLES // ncols)
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def _placeholders(nrows: int, ncols: int, suffix: str = "") -> str:
+    row = "(" + ", ".join("?" * ncols) + suffix + ")"
+    return ", ".join([row] * nrows)
+
+
+def ingest_batch(conn: sqlite3.Connection, items: list) -> dict:
+    """Upsert classified listing items into source_documents and events.
+
+    Each item carries url, title, event_date, canonical_key, event_subtype,
+    source_entity_id and optionally raw_html / event_type. Rows are written with
+    multi-row `INSERT ... ON CONFLICT ... RETURNING`, so a batch costs a few
+    statements rather than several per item. Inserted vs updated is read off the
+    returned ids: AUTOINCREMENT ids of new rows are always above the prior max.
+
+    Every (event_date, source_entity_id) bucket the batch touches, including the
+    old bucket of an event whose date or source moved, is recorded in
+    signal_dirty for incremental signal generation.
+
+    Does not commit; the caller owns the transaction.
+    """
+    result = {"inserted": 0, "updated": 0, "event_ids": {}, "touched": set()}
+    if not items:
+        return result
+
+    # One row per conflict key: a single upsert statement may not touch a row twice.
+    docs = {it["url"]: it for it in items}
+    events = {it["canonical_key"]: it for it in items}
+
+    doc_ids = {}
+    doc_rows = [(it["url"], it["event_date"], it.get("raw_html")) for it in docs.values()]
+    for chunk in _chunks(doc_rows, len(SOURCE_DOC_COLS)):
+        sql = f"""
+            INSERT INTO source_documents (url, published_date, raw_html, fetched_at)
+            VALUES {_placeholders(len(chunk), len(SOURCE_DOC_COLS), ", datetime('now')")}
+            ON CONFLICT(url) DO UPDATE SET
+              published_date = excluded.published_date,
+              raw_html = COALESCE(excluded.raw_html, source_documents.raw_html),
+              fetched_at = excluded.fetched_at
+            RETURNING id, url
+        """
+        doc_ids.update((url, i) for i, url in
+                       conn.execute(sql, [v for row in chunk for v in row]).fetchall())
+
+    prev_max = conn.execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()[0]
+    event_rows = [
+        (it["canonical_key"], it["event_date"], it["title"], it["url"],
+         it.get("event_type", "news"), it.get("event_subtype"), doc_ids.get(it["url"]),
+         it.get("source_entity_id"))
+        for it in events.values()
+    ]
+    touched = result["touched"]
+    for chunk in _chunks(event_rows, len(EVENT_COLS)):
+        keys = [row[0] for row in chunk]
+        touched.update(conn.execute(
+            f"SELECT event_date, source_entity_id FROM events "
+            f"WHERE canonical_event_key IN ({', '.join('?' * len(keys))})",
+            keys,
+        ).fetchall())
+        touched.update((row[1], row[7]) for row in chunk)
+        sql = f"""
+            INSERT INTO events ({", ".join(EVENT_COLS)})
+            VALUES {_placeholders(len(chunk), len(EVENT_COLS))}
+            ON CONFLICT(canonical_event_key) DO UPDATE SET
+              title = excluded.title,
+              event_date = excluded.event_date,
+              url = excluded.url,
+              source_doc_id = excluded.source_doc_id,
+              source_entity_id = excluded.source_entity_id,
+              event_subtype = excluded.event_subtype
+            RETURNING id, canonical_event_key
+        """
+        for event_id, key in conn.execute(sql, [v for row in chunk for v in row]).fetchall():
+            result["event_ids"][key] = event_id
+            if event_id > prev_max:
+                result["inserted"] += 1
+            else:
+                result["updated"] += 1
+
+    mark_dirty(conn, touched)
+    return result
+
+
+def mark_dirty(conn: sqlite3.Connection, buckets) -> None:
+    conn.executemany(
+        "INSERT INTO signal_dirty (event_date, source_entity_id) VALUES (?, ?)",
+        sorted(set(buckets), key=lambda b: (b[0] or "", b[1] or "")),
+    )
+
+
+def load_dirty(conn: sqlite3.Connection) -> tuple:
+    """Return (buckets, high_id): pending (event_date, source_entity_id) pairs and the
+    last marker id read, so `clear_dirty` never drops marks added after the read."""
+    rows = conn.execute("""
+        SELECT event_date, source_entity_id, MAX(id)
+        FROM signal_dirty
+        GROUP BY event_date, source_entity_id
+    """).fetchall()
+    return {(r[0], r[1]) for r in rows}, max((r[2] for r in rows), default=0)
+
+
+def clear_dirty(conn: sqlite3.Connection, high_id: int) -> None:
+    conn.execute("DELETE FROM signal_dirty WHERE id <= ?", (high_id,))
@@ -0,0 +1,129 @@
+import re
+from datetime import date
+from typing import NamedTuple
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+from bs4.filter import ElementFilter
+
+from rockquant.sources.crawl import next_page_url
+
+try:
+    import lxml  # noqa: F401
+    HAVE_LXML = True
+except ImportError:
+    HAVE_LXML = False
+
+# lxml is the faster tree builder on strained listing pages of every size
+# (see benchmarks/bench_listing.py); html.parser is the fallback without it.
+DEFAULT_BACKEND = "lxml" if HAVE_LXML else "html.parser"
+
+MONTHS = {
+    m: i for i, m in enumerate(
+        ("January", "February", "March", "April", "May", "June", "July",
+         "August", "September", "October", "November", "December"), start=1)
+}
+DATE_RE = re.compile(
+    r"\b(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{1,2}),\s+(\d{4})\b"
+)
+
+KEEP_CLASS_RE = re.compile(r"^(views-row|pager|pagination|usa-pagination)")
+
+
+def _attr_values(value) -> list:
+    if not value:
+        return []
+    return value.split() if isinstance(value, str) else list(value)
+
+
+class _ListingFilter(ElementFilter):
+    """Builds only listing rows, pager/pagination containers and rel=next links.
+
+    Everything next_page_url (rockquant.sources.crawl) can select survives; the
+    rest of the page (navigation, footer, scripts) is skipped by the tokenizer.
+    A kept element keeps its whole subtree.
+    """
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        attrs = attrs or {}
+        if name == "a" and "next" in _attr_values(attrs.get("rel")):
+            return True
+        return any(KEEP_CLASS_RE.match(c) for c in _attr_values(attrs.get("class")))
+
+    def allow_string_creation(self, string) -> bool:
+        return False
+
+
+LISTING_STRAINER = _ListingFilter()
+
+
+class ListingItem(NamedTuple):
+    url: str
+    title: str
+    event_date: str  # ISO yyyy-mm-dd
+    raw_html: str
+
+
+class ListingPage(NamedTuple):
+    items: list
+    skipped_no_link: int
+    skipped_no_date: int
+    next_url: str | None
+
+
+def iso_date(text: str) -> str | None:
+    """First "Month D, YYYY" in `text` as ISO, or None (also for impossible dates)."""
+    m = DATE_RE.search(text)
+    if not m:
+        return None
+    try:
+        return date(int(m.group(3)), MONTHS[m.group(1)], int(m.group(2))).isoformat()
+    except ValueError:
+        return None
+
+
+def parse_listing_html(html: str | bytes, page_url: str, article_prefixes: tuple,
+                       max_items: int | None = None, backend: str | None = None) -> ListingPage:
+    """Parse a Drupal `div.views-row` listing page into ListingItems.
+
+    Each row yields its first link under `article_prefixes` (title = link text)
+    and the first date among the row's strings. Rows without either are counted
+    as skipped. `backend` is a BeautifulSoup tree builder name; the default
+    is lxml when installed.
+    """
+    soup = BeautifulSoup(html, backend or DEFAULT_BACKEND, parse_only=LISTING_STRAINER)
+    rows = soup.find_all("div", class_="views-row")
+    if max_items is not None:
+        rows = rows[:max_items]
+    p = urlparse(page_url)
+    base = f"{p.scheme}://{p.netloc}"
+
+    items = []
+    skipped_no_link = 0
+    skipped_no_date = 0
+    for row in rows:
+        # strict article link selection
+        article_href = None
+        title = None
+        for a in row.find_all("a", href=True):
+            href = a["href"].strip()
+            if href.startswith(article_prefixes):
+                # Avoid capturing the listing page itself
+                if href.rstrip("/") == "/newsroom/press-releases":
+                    continue
+                article_href = href
+                title = a.get_text(" ", strip=True)
+                break
+        if not article_href:
+            skipped_no_link += 1
+            continue
+
+        article_url = article_href if article_href.startswith("http") else urljoin(base, article_href)
+        # "|" keeps a date from being stitched together across two strings
+        event_date = iso_date("|".join(row.stripped_strings))
+        if not event_date:
+            skipped_no_date += 1
+            continue
+        items.append(ListingItem(article_url, (title or "").strip() or article_url, event_date, str(row)))
+
+    return ListingPage(items, skipped_no_link, skipped_no_date, next_page_url(soup, page_url))
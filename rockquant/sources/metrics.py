@@ -0,0 +1,264 @@
+import argparse
+import cProfile
+import json
+import os
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from rockquant.db.connection import connect
+
+# Upper bounds (seconds) of the latency buckets; the last bucket is +Inf.
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# BEGIN IMMEDIATE on an idle database takes microseconds; anything slower
+# waited (inside busy_timeout) for another connection's write lock.
+BUSY_WAIT_S = 0.001
+PROM_PREFIX = "rockquant_pipeline"
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def merge(self, state: dict) -> None:
+        self.counts = [a + b for a, b in zip(self.counts, state["counts"])]
+        self.count += state["count"]
+        self.sum += state["sum"]
+        self.max = max(self.max, state["max"])
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation (max when past the last)."""
+        rank, seen = q * self.count, 0
+        for bound, n in zip(BUCKETS, self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def state(self) -> dict:
+        return {"counts": self.counts, "count": self.count, "sum": self.sum, "max": self.max}
+
+    def to_dict(self) -> dict:
+        cumulative, seen = {}, 0
+        for bound, n in zip(BUCKETS + ("+Inf",), self.counts):
+            seen += n
+            cumulative[str(bound)] = seen
+        return {
+            "count": self.count, "total_s": round(self.sum, 6), "max_s": round(self.max, 6),
+            "p50_s": round(self.quantile(0.5), 6), "p95_s": round(self.quantile(0.95), 6),
+            "buckets": cumulative,
+        }
+
+
+class RunMetrics:
+    """Latency histograms and counters of one pipeline run, per stage and per feed.
+
+    Stages: fetch, parse, classify, write (DB write of a page or batch), signals,
+    trends, articles. Counters: bytes, retries, rows (per stage), busy_waits and
+    busy_timeouts (SQLite write lock). A feed of "" is the all-feeds total.
+    Thread-safe; worker processes ship state() to the writer, which merge()s it.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hists = {}     # (stage, feed) -> Histogram
+        self.counters = {}  # (name, stage, feed) -> number
+        self.started = time.time()
+
+    def observe(self, stage: str, seconds: float, feed: str | None = None) -> None:
+        with self.lock:
+            for key in {(stage, ""), (stage, feed or "")}:
+                h = self.hists.get(key)
+                if h is None:
+                    h = self.hists[key] = Histogram()
+                h.observe(seconds)
+
+    def add(self, name: str, n: float = 1, stage: str = "", feed: str | None = None) -> None:
+        with self.lock:
+            for key in {(name, stage, ""), (name, stage, feed or "")}:
+                self.counters[key] = self.counters.get(key, 0) + n
+
+    @contextmanager
+    def timed(self, stage: str, feed: str | None = None):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - t, feed)
+
+    def begin_write(self, conn: sqlite3.Connection) -> None:
+        """Open the write transaction explicitly, timing the wait for the write lock."""
+        if conn.in_transaction:
+            return
+        t = time.perf_counter()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError:
+            self.add("busy_timeouts")
+            raise
+        waited = time.perf_counter() - t
+        self.observe("lock_wait", waited)
+        if waited >= BUSY_WAIT_S:
+            self.add("busy_waits")
+
+    def state(self) -> dict:
+        with self.lock:
+            return {"hists": [(k, h.state()) for k, h in self.hists.items()],
+                    "counters": list(self.counters.items())}
+
+    def merge(self, state: dict) -> None:
+        with self.lock:
+            for key, hs in state["hists"]:
+                key = tuple(key)
+                h = self.hists.get(key)
+                if h is None:
+                    h = self.hists[key] = Histogram()
+                h.merge(hs)
+            for key, n in state["counters"]:
+                key = tuple(key)
+                self.counters[key] = self.counters.get(key, 0) + n
+
+    def report(self) -> dict:
+        """{started_at, duration_s, stages, feeds, counters}; rows_per_s uses the stage's total time."""
+        with self.lock:
+            stages, feeds = {}, {}
+            for (stage, feed), h in sorted(self.hists.items()):
+                if feed:
+                    feeds.setdefault(feed, {"stages": {}})["stages"][stage] = h.to_dict()
+                    continue
+                stages[stage] = h.to_dict()
+                rows = self.counters.get(("rows", stage, ""))
+                if rows is not None:
+                    stages[stage]["rows"] = rows
+                    stages[stage]["rows_per_s"] = round(rows / h.sum, 1) if h.sum else None
+            counters = {}
+            for (name, stage, feed), n in sorted(self.counters.items()):
+                if name == "rows":
+                    if feed:
+                        feeds.setdefault(feed, {"stages": {}})["stages"].setdefault(stage, {})["rows"] = n
+                    continue
+                if feed:
+                    feeds.setdefault(feed, {"stages": {}})[name] = n
+                else:
+                    counters[name] = n
+        return {
+            "started_at": datetime.fromtimestamp(self.started, timezone.utc).isoformat(timespec="seconds"),
+            "duration_s": round(time.time() - self.started, 3),
+            "stages": stages,
+            "feeds": feeds,
+            "counters": counters,
+        }
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def prometheus_text(report: dict, prefix: str = PROM_PREFIX) -> str:
+    """Prometheus text exposition of a run report (for the node_exporter textfile collector)."""
+    lines = [f"# HELP {prefix}_stage_seconds Pipeline stage latency",
+             f"# TYPE {prefix}_stage_seconds histogram"]
+    series = [({"stage": s}, h) for s, h in report["stages"].items()]
+    series += [({"stage": s, "feed": f}, h) for f, fr in report["feeds"].items()
+               for s, h in fr["stages"].items() if "buckets" in h]
+    for labels, h in series:
+        for le, n in h["buckets"].items():
+            lines.append(f"{prefix}_stage_seconds_bucket{_labels(**labels, le=le)} {n}")
+        lines.append(f"{prefix}_stage_seconds_sum{_labels(**labels)} {h['total_s']}")
+        lines.append(f"{prefix}_stage_seconds_count{_labels(**labels)} {h['count']}")
+    lines += [f"# TYPE {prefix}_rows_total counter"]
+    lines += [f"{prefix}_rows_total{_labels(stage=s)} {h['rows']}"
+              for s, h in report["stages"].items() if "rows" in h]
+    for name in ("bytes", "retries"):
+        lines.append(f"# TYPE {prefix}_{name}_total counter")
+        lines += [f"{prefix}_{name}_total{_labels(feed=f)} {fr[name]}"
+                  for f, fr in report["feeds"].items() if name in fr]
+    for name, n in report["counters"].items():
+        if name not in ("bytes", "retries"):
+            lines += [f"# TYPE {prefix}_{name}_total counter", f"{prefix}_{name}_total {n}"]
+    lines += [f"# TYPE {prefix}_duration_seconds gauge",
+              f"{prefix}_duration_seconds {report['duration_s']}"]
+    return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def profiled(path: str | None):
+    """cProfile the block into `path` (pstats format); a no-op when path is None."""
+    if not path:
+        yield
+        return
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        prof.dump_stats(path)
+
+
+def record_run(conn: sqlite3.Connection, status: str, report: dict) -> int:
+    """Store a run report in pipeline_runs and commit; returns the run id."""
+    cur = conn.execute(
+        "INSERT INTO pipeline_runs (status, duration_s, report, started_at) VALUES (?, ?, ?, ?)",
+        (status, report["duration_s"], json.dumps(report), report["started_at"]))
+    conn.commit()
+    return cur.lastrowid
+
+
+def finish_run(conn: sqlite3.Connection, metrics: RunMetrics, result: dict, config: dict) -> dict:
+    """Attach timings to `result`, store the run report and write the Prometheus file if configured."""
+    report = metrics.report()
+    report["result"] = {k: v for k, v in result.items() if k != "feed_errors"}
+    report["feed_errors"] = result.get("feed_errors", [])
+    if config.get("profile"):
+        report["profile"] = config["profile"]
+    result["timings"] = {stage: h["total_s"] for stage, h in report["stages"].items()}
+    result["duration_s"] = report["duration_s"]
+    if config.get("record_run", True):
+        result["run_id"] = record_run(conn, result["status"], report)
+    if config.get("metrics_prometheus"):
+        tmp = f"{config['metrics_prometheus']}.tmp"
+        with open(tmp, "w") as f:
+            f.write(prometheus_text(report))
+        os.replace(tmp, config["metrics_prometheus"])
+    return result
+
+
+def load_run(conn: sqlite3.Connection, run_id: int | None = None) -> dict | None:
+    row = conn.execute(
+        "SELECT id, report FROM pipeline_runs WHERE id = ?" if run_id is not None
+        else "SELECT id, report FROM pipeline_runs ORDER BY id DESC LIMIT 1",
+        (run_id,) if run_id is not None else ()).fetchone()
+    return row and {"run_id": row[0], **json.loads(row[1])}
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Show a stored pipeline run report")
+    ap.add_argument("db_path")
+    ap.add_argument("--run", type=int, help="run id (default: latest)")
+    ap.add_argument("--prometheus", action="store_true", help="Prometheus text format instead of JSON")
+    args = ap.parse_args()
+    conn = connect(args.db_path, readonly=True)
+    try:
+        run = load_run(conn, args.run)
+    finally:
+        conn.close()
+    if run is None:
+        raise SystemExit("no pipeline runs recorded")
+    print(prometheus_text(run) if args.prometheus else json.dumps(run, indent=2))
@@ -0,0 +1,92 @@
+import argparse
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+from rockquant.db.connection import connect
+from rockquant.sources.ingest import clear_dirty, load_dirty, mark_dirty
+from rockquant.sources.registry import signal_source
+from rockquant.sources.signals import run_signal_engine
+
+
+def _classify(job: tuple) -> list:
+    entity_id, titles = job
+    return signal_source(entity_id).classify_titles(titles)
+
+
+def reclassify_events(db_path: str, chunk_size: int = 20000, workers: int = 0,
+                      source_entity_id: str | None = None, regenerate_signals: bool = True) -> dict:
+    """Rewrite events.event_subtype for the whole history with the current rules.
+
+    Walks `events` in id order, `chunk_size` rows per transaction, classifying each
+    row with its source's rule set (split across `workers` processes when > 1).
+    Only rows whose subtype changed are written; their buckets are marked dirty
+    and, unless `regenerate_signals` is False, signals for them are rebuilt at
+    the end.
+    """
+    conn = connect(db_path)
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    scanned = changed = 0
+    try:
+        where = "AND source_entity_id = ?" if source_entity_id else ""
+        last_id = 0
+        while True:
+            params = [last_id] + ([source_entity_id] if source_entity_id else []) + [chunk_size]
+            rows = conn.execute(f"""
+                SELECT id, title, event_subtype, event_date, source_entity_id
+                FROM events
+                WHERE id > ? {where}
+                ORDER BY id
+                LIMIT ?
+            """, params).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            scanned += len(rows)
+
+            by_entity = {}
+            for row in rows:
+                by_entity.setdefault(row[4], []).append(row)
+            jobs = []
+            for entity_id, group in by_entity.items():
+                step = max(1, len(group) // max(1, workers)) if pool else len(group)
+                for i in range(0, len(group), step):
+                    jobs.append((entity_id, group[i:i + step]))
+            titles = [(entity_id, [r[1] for r in group]) for entity_id, group in jobs]
+            results = pool.map(_classify, titles) if pool else map(_classify, titles)
+
+            updates = []
+            touched = set()
+            for (_, group), subtypes in zip(jobs, results):
+                for row, subtype in zip(group, subtypes):
+                    if subtype != row[2]:
+                        updates.append((subtype, row[0]))
+                        touched.add((row[3], row[4]))
+            if updates:
+                conn.executemany("UPDATE events SET event_subtype = ? WHERE id = ?", updates)
+                mark_dirty(conn, touched)
+                changed += len(updates)
+            conn.commit()
+
+        signals = 0
+        if regenerate_signals:
+            dirty, high = load_dirty(conn)
+            if dirty:
+                signals = run_signal_engine(conn, dirty=dirty)["signals"]
+                clear_dirty(conn, high)
+                conn.commit()
+        return {"scanned": scanned, "changed": changed, "signals": signals}
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        conn.close()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Reclassify events.event_subtype with the current rules")
+    ap.add_argument("db_path")
+    ap.add_argument("--chunk-size", type=int, default=20000)
+    ap.add_argument("--workers", type=int, default=0)
+    ap.add_argument("--source", dest="source_entity_id")
+    ap.add_argument("--no-signals", dest="regenerate_signals", action="store_false")
+    args = ap.parse_args()
+    print(json.dumps(reclassify_events(**vars(args)), indent=2))
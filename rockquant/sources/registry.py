@@ -0,0 +1,122 @@
+from dataclasses import dataclass, field
+from typing import Callable
+from urllib.parse import urlparse
+
+from rockquant.sources.doe_edf import classify as doe_classify
+from rockquant.sources.fast41 import classify as fast41_classify
+
+
+@dataclass(frozen=True)
+class Source:
+    """A feed family: where it lives, how titles classify, and how subtypes score.
+
+    signal_weights maps event_subtype -> (signal_type, weight). Subtypes missing
+    from it score as `default_signal`, or are ignored when that is None.
+    """
+    entity_id: str
+    feeds: tuple
+    hosts: tuple
+    classify: Callable[[str], str]
+    signal_weights: dict = field(default_factory=dict)
+    default_signal: tuple | None = None
+    signal_scope: str = "global"
+    path_prefixes: tuple = ()
+    article_prefixes: tuple = ()
+    classify_many: Callable[[list], list] | None = None
+
+    def matches(self, feed_url: str) -> bool:
+        p = urlparse(feed_url)
+        netloc = p.netloc.lower()
+        if not any(h in netloc for h in self.hosts):
+            return False
+        return not self.path_prefixes or any(p.path.startswith(pp) for pp in self.path_prefixes)
+
+    def classify_titles(self, titles) -> list:
+        if self.classify_many is not None:
+            return self.classify_many(titles)
+        return [self.classify(t) for t in titles]
+
+
+DOE_LPO = Source(
+    entity_id="DOE_LPO",
+    feeds=(
+        "https://www.energy.gov/lpo/listings/edf-news",
+        "https://www.energy.gov/lpo/listings/lpo-press-releases",
+    ),
+    hosts=("energy.gov",),
+    path_prefixes=("/lpo/",),
+    article_prefixes=("/articles/", "/lpo/articles/"),
+    classify=doe_classify.classify_edf_subtype,
+    classify_many=doe_classify.classify_many,
+    signal_weights={
+        "DEAL_CLOSED_LOAN": ("funding_velocity", 3.0),
+        "DEAL_CLOSED_LOAN_GUARANTEE": ("funding_velocity", 3.0),
+        "DISBURSEMENT_APPROVED": ("funding_velocity", 2.0),
+        "DEAL_RESTRUCTURED": ("risk_indicator", 1.0),
+        "CONDITIONAL_COMMITMENT_TERMINATED": ("risk_indicator", -3.0),
+        "REPAYMENT_RECEIVED": ("funding_velocity", 1.0),
+        "DEAL_ANNOUNCED": ("opportunity_alert", 1.0),
+        "CONDITIONAL_COMMITMENT_ANNOUNCED": ("opportunity_alert", 1.0),
+        "CONDITIONAL_COMMITMENT_ISSUED": ("opportunity_alert", 2.0),
+    },
+)
+
+FAST41_COUN = Source(
+    entity_id="FAST41_COUN",
+    feeds=("https://www.permitting.gov/newsroom/press-releases",),
+    hosts=("permitting.gov",),
+    article_prefixes=("/newsroom/press-releases/",),
+    classify=fast41_classify.classify_fast41_subtype,
+    classify_many=fast41_classify.classify_many,
+    # Simple deterministic scoring for FAST-41 press releases (v1)
+    signal_weights={
+        "FAST41_ADDED": ("permitting_velocity", 3.0),
+        "PERMITTING_APPROVAL": ("permitting_velocity", 3.0),
+        "MILESTONE_UPDATE": ("permitting_milestone", 2.0),
+        "PROGRESS_UPDATE": ("permitting_milestone", 2.0),
+        "SITE_VISIT": ("policy_signal", 1.0),
+        "FAST41_NEWS": ("policy_signal", 0.5),
+    },
+    default_signal=("policy_signal", 0.5),
+    signal_scope="FAST41_COUN",
+)
+
+_REGISTRY = {}
+
+
+def register(source: Source) -> Source:
+    """Add (or replace) a source; the first one registered is the default."""
+    _REGISTRY[source.entity_id] = source
+    return source
+
+
+def all_sources() -> list:
+    return list(_REGISTRY.values())
+
+
+def get_source(entity_id: str | None) -> Source | None:
+    return _REGISTRY.get(entity_id or "")
+
+
+def default_source() -> Source:
+    return next(iter(_REGISTRY.values()))
+
+
+def source_for_feed(feed_url: str) -> Source | None:
+    for source in _REGISTRY.values():
+        if source.matches(feed_url):
+            return source
+    return None
+
+
+def all_article_prefixes() -> tuple:
+    return tuple(dict.fromkeys(p for source in _REGISTRY.values() for p in source.article_prefixes))
+
+
+def signal_source(entity_id: str | None) -> Source:
+    """Source whose weights score an event; unknown or missing ids fall back to the default."""
+    return get_source(entity_id) or default_source()
+
+
+register(DOE_LPO)
+register(FAST41_COUN)
@@ -0,0 +1,111 @@
+import argparse
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+from rockquant.db.connection import connect
+from rockquant.db.migrate import migrate
+from rockquant.sources.archive import load_page
+from rockquant.sources.doe_edf.pipeline import classify_items, listing_items, source_entity_for_feed
+from rockquant.sources.fts import reindex_bodies
+from rockquant.sources.ingest import clear_dirty, ingest_batch, load_dirty
+from rockquant.sources.listing import parse_listing_html
+from rockquant.sources.registry import all_article_prefixes
+from rockquant.sources.signals import run_signal_engine
+
+
+def _parse_page(job: tuple) -> tuple:
+    feed_url, body_zlib, article_prefixes, backend = job
+    page = parse_listing_html(load_page(body_zlib), feed_url, article_prefixes, backend=backend)
+    items = classify_items(listing_items(page.items), feed_url, source_entity_for_feed(feed_url))
+    return items, page.skipped_no_link, page.skipped_no_date
+
+
+def replay(db_path: str, archive_db: str | None = None, workers: int = 0, rebuild: bool = False,
+           batch_pages: int = 64, parser_backend: str | None = None) -> dict:
+    """Re-parse, re-classify and re-ingest archived listing pages without the network.
+
+    Each distinct (feed, page content) in the archive is replayed once, in the
+    order it was last fetched, so later versions of an item win as they did
+    live. Pages are parsed and classified on a process pool of `workers` (in
+    process when <= 1) and written by this process alone, one transaction per
+    `batch_pages` pages. `rebuild` empties events and signals first and ends with
+    a full signal rebuild and a re-index of archived article bodies.
+    """
+    migrate(db_path)
+    conn = connect(db_path)
+    src = conn if not archive_db or archive_db == db_path else connect(archive_db, readonly=True)
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    prefixes = all_article_prefixes()
+    pages = items_parsed = new_events = skipped = 0
+    try:
+        if rebuild:
+            conn.execute("DELETE FROM signals")
+            conn.execute("DELETE FROM events")
+            conn.execute("DELETE FROM signal_dirty")
+            conn.commit()
+
+        plan = src.execute("""
+            SELECT MAX(id) AS last_id, feed_url, content_sha256
+            FROM page_fetches
+            GROUP BY feed_url, content_sha256
+            ORDER BY last_id
+        """).fetchall()
+
+        for i in range(0, len(plan), batch_pages):
+            chunk = plan[i:i + batch_pages]
+            shas = sorted({sha for _, _, sha in chunk})
+            bodies = dict(src.execute(
+                f"SELECT content_sha256, body_zlib FROM page_archive "
+                f"WHERE content_sha256 IN ({','.join('?' * len(shas))})",
+                shas,
+            ).fetchall())
+            jobs = [(feed_url, bodies[sha], prefixes, parser_backend)
+                    for _, feed_url, sha in chunk if sha in bodies]
+            results = pool.map(_parse_page, jobs) if pool else map(_parse_page, jobs)
+
+            batch = []
+            for items, no_link, no_date in results:
+                batch.extend(items)
+                skipped += no_link + no_date
+                pages += 1
+            items_parsed += len(batch)
+            new_events += ingest_batch(conn, batch)["inserted"]
+            conn.commit()
+
+        if rebuild:
+            signals = run_signal_engine(conn, dirty=None)["signals"]
+            conn.execute("DELETE FROM signal_dirty")
+            reindex_bodies(conn)
+        else:
+            dirty, high = load_dirty(conn)
+            signals = run_signal_engine(conn, dirty=dirty)["signals"] if dirty else 0
+            clear_dirty(conn, high)
+        conn.commit()
+        total_events = conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+        return {
+            "status": "ok",
+            "pages": pages,
+            "items_parsed": items_parsed,
+            "skipped": skipped,
+            "events": total_events,
+            "new_events": new_events,
+            "signals": signals,
+        }
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if src is not conn:
+            src.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Rebuild events/signals from archived listing pages")
+    ap.add_argument("db_path")
+    ap.add_argument("--archive", dest="archive_db", help="database holding the page archive (default: db_path)")
+    ap.add_argument("--workers", type=int, default=0)
+    ap.add_argument("--rebuild", action="store_true", help="empty events and signals first")
+    ap.add_argument("--batch-pages", type=int, default=64)
+    ap.add_argument("--parser-backend")
+    args = ap.parse_args()
+    print(json.dumps(replay(**vars(args)), indent=2))
@@ -0,0 +1,63 @@
+import re
+
+
+class Not(str):
+    """A rule pattern that must NOT match."""
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase and collapse whitespace (same result as re.sub(r"\\s+", " ", ...))."""
+    return " ".join((title or "").lower().split())
+
+
+def strip_lower(title: str) -> str:
+    return (title or "").strip().lower()
+
+
+class RuleSet:
+    """An ordered subtype rule table, compiled once.
+
+    `rules` is a sequence of (subtype, alternatives, triggers). Each alternative
+    is a tuple of patterns that must all `re.search` the normalized title (wrap
+    a pattern in `Not` to require that it does not). The first rule with a
+    satisfied alternative wins, as in an if/elif chain.
+
+    `triggers` are literal substrings at least one of which any title matching
+    the rule must contain. They are checked with `in` before any regex runs, so
+    a title only pays for the regexes of rules it could plausibly match. Pass
+    an empty tuple to always evaluate a rule.
+    """
+
+    def __init__(self, rules, default: str, normalize=normalize_title):
+        self.default = default
+        self.normalize = normalize
+        self.rules = tuple(
+            (subtype,
+             tuple(tuple((isinstance(p, Not), re.compile(p)) for p in clause) for clause in alternatives),
+             tuple(triggers))
+            for subtype, alternatives, triggers in rules
+        )
+
+    def classify(self, title: str) -> str:
+        t = self.normalize(title)
+        for subtype, alternatives, triggers in self.rules:
+            if triggers and not any(trig in t for trig in triggers):
+                continue
+            for clause in alternatives:
+                for negate, pattern in clause:
+                    if (pattern.search(t) is None) != negate:
+                        break
+                else:
+                    return subtype
+        return self.default
+
+    def classify_many(self, titles) -> list:
+        """Classify an iterable of titles; repeated titles are matched once."""
+        seen = {}
+        out = []
+        for title in titles:
+            subtype = seen.get(title)
+            if subtype is None:
+                subtype = seen[title] = self.classify(title)
+            out.append(subtype)
+        return out
@@ -0,0 +1,224 @@
+import argparse
+import json
+import multiprocessing as mp
+import queue
+import time
+import traceback
+from collections import Counter
+from urllib.parse import urlparse
+
+from rockquant.db.connection import connect
+from rockquant.db.migrate import migrate
+from rockquant.sources.archive import archive_page
+from rockquant.sources.cache import store_cache
+from rockquant.sources.crawl import CRAWL_MODES, store_watermark
+from rockquant.sources.doe_edf.pipeline import (
+    crawl_feeds, host_pool, normalize_feeds, pipeline_result, post_ingest,
+)
+from rockquant.sources.ingest import ingest_batch, load_dirty
+from rockquant.sources.metrics import RunMetrics, finish_run, profiled
+from rockquant.sources.registry import all_sources
+
+SUMMED_STATS = ("items_parsed", "pages_fetched", "pages_ingested",
+                "skipped_no_link", "skipped_no_date", "feeds_unchanged")
+
+
+class QueueSink:
+    """crawl_feeds sink of a worker process: every write goes to the writer's queue."""
+
+    stage = "queue_put"  # time blocked on a full queue, i.e. waiting for the writer
+
+    def __init__(self, q, job: int):
+        self.q = q
+        self.job = job
+
+    def unchanged(self, url: str, result: dict) -> None:
+        self.q.put(("unchanged", self.job, url, result))
+
+    def page(self, url: str, feed_url: str, result: dict, items: list) -> None:
+        self.q.put(("page", self.job, url, feed_url, result, items))
+
+    def watermark(self, feed_url: str, newest: dict | None, pages: int, items: int, crawl_mode: str,
+                  resume: dict | None = None) -> None:
+        self.q.put(("watermark", self.job, feed_url, newest, pages, items, crawl_mode, resume))
+
+
+def _host(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+def _worker(wid: int, db_path: str, shard: list, share: float, q) -> None:
+    """Crawl every (job, config, feeds) of `shard` with a read-only connection."""
+    conn = connect(db_path, readonly=True)
+    try:
+        for job, config, feeds in shard:
+            pool = host_pool(config, share)
+            metrics = RunMetrics()
+            try:
+                stats = crawl_feeds(conn, feeds, config, pool, QueueSink(q, job), metrics)
+            except Exception:
+                stats = {"feed_errors": [{"feed": name, "url": url, "error": traceback.format_exc(limit=3)}
+                                         for name, url in feeds]}
+            finally:
+                pool.close()
+            q.put(("stats", job, stats, wid, metrics.state()))
+    finally:
+        conn.close()
+        q.put(("done", wid))
+
+
+def _shards(jobs: list, workers: int) -> tuple:
+    """Deal feeds round-robin over `workers` shards; returns (shards, per-shard rate share).
+
+    A host crawled by k shards gets 1/k of its configured rate in each of them,
+    so together they stay within rate_limit_s.
+    """
+    shards = [[] for _ in range(workers)]
+    n = 0
+    for job, (config, feeds) in enumerate(jobs):
+        split = [[] for _ in range(workers)]
+        for feed in feeds:
+            split[n % workers].append(feed)
+            n += 1
+        for w, part in enumerate(split):
+            if part:
+                shards[w].append((job, config, part))
+    hosts_per_shard = [{_host(url) for _, _, feeds in shard for _, url in feeds} for shard in shards]
+    sharing = Counter(h for hosts in hosts_per_shard for h in hosts)
+    shares = [1.0 / max((sharing[h] for h in hosts), default=1) for hosts in hosts_per_shard]
+    return shards, shares
+
+
+def run_sharded(db_path: str, configs: list, workers: int | None = None,
+                batch_pages: int = 16, queue_size: int = 256) -> dict:
+    """Run one or more pipeline configs with feeds sharded over worker processes.
+
+    Workers fetch, parse and classify (see crawl_feeds) and stream classified
+    pages over a bounded queue; this process is the only SQLite writer and
+    commits every `batch_pages` pages, or sooner when the queue runs dry.
+    Signals, trends and article bodies then run once, with the first config's
+    options. Returns run_pipeline's result summed over all configs, plus
+    `workers`; the workers' metrics are merged into one pipeline_runs report,
+    whose "write" and "commit" stages are this process's batched writes.
+    """
+    configs = [dict(c) for c in configs]
+    for config in configs:
+        if config.get("crawl_mode", "incremental") not in CRAWL_MODES:
+            raise ValueError(f"crawl_mode must be one of {CRAWL_MODES}, got {config['crawl_mode']!r}")
+    jobs = [(config, normalize_feeds(config.get("feeds") or [u for s in all_sources() for u in s.feeds]))
+            for config in configs]
+    n_feeds = sum(len(feeds) for _, feeds in jobs)
+    workers = max(1, min(workers or mp.cpu_count(), n_feeds or 1))
+    shards, shares = _shards(jobs, workers)
+
+    migrate(db_path)
+    conn = connect(db_path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    metrics = RunMetrics()
+    feed_names = {url: name for _, feeds in jobs for name, url in feeds}
+    # spawn: workers must not inherit this process's SQLite handle
+    ctx = mp.get_context("spawn")
+    q = ctx.Queue(maxsize=queue_size)
+    procs = {}
+    for wid, shard in enumerate(shards):
+        if shard:
+            procs[wid] = ctx.Process(target=_worker, args=(wid, db_path, shard, shares[wid], q), daemon=True)
+            procs[wid].start()
+
+    stats = {k: 0 for k in SUMMED_STATS}
+    stats.update(new_events=0, updated_events=0, feed_errors=[])
+    reported = set()
+    pending = 0
+
+    def write(msg) -> None:
+        nonlocal pending
+        kind, job = msg[0], msg[1]
+        config = jobs[job][0]
+        metrics.begin_write(conn)
+        if kind == "page":
+            _, _, url, feed_url, result, items = msg
+            t = time.perf_counter()
+            if config.get("archive_pages", True):
+                archive_page(conn, url, feed_url, result)
+            written = ingest_batch(conn, items)
+            # validators land in the same transaction as the rows, as in DirectSink
+            store_cache(conn, url, result)
+            metrics.observe("write", time.perf_counter() - t, feed_names.get(feed_url))
+            metrics.add("rows", len(items), "write", feed_names.get(feed_url))
+            stats["new_events"] += written["inserted"]
+            stats["updated_events"] += written["updated"]
+            pending += 1
+        elif kind == "unchanged":
+            store_cache(conn, msg[2], msg[3])
+        elif kind == "watermark":
+            store_watermark(conn, *msg[2:])
+
+    def flush() -> None:
+        nonlocal pending
+        if conn.in_transaction:
+            with metrics.timed("commit"):
+                conn.commit()
+        pending = 0
+
+    try:
+        live = set(procs)
+        while live:
+            try:
+                msg = q.get(timeout=0.5 if pending == 0 else 0.05)
+            except queue.Empty:
+                flush()
+                dead = {wid for wid in live if not procs[wid].is_alive()}
+                for wid in dead:
+                    live.discard(wid)
+                    for job, _, feeds in shards[wid]:
+                        if (wid, job) not in reported:
+                            stats["feed_errors"].extend(
+                                {"feed": name, "url": url,
+                                 "error": f"worker exited with code {procs[wid].exitcode}"}
+                                for name, url in feeds)
+                continue
+            if msg[0] == "done":
+                live.discard(msg[1])
+            elif msg[0] == "stats":
+                reported.add((msg[3], msg[1]))
+                metrics.merge(msg[4])
+                for k in SUMMED_STATS:
+                    stats[k] += msg[2].get(k, 0)
+                stats["feed_errors"].extend(msg[2].get("feed_errors", []))
+            else:
+                write(msg)
+                if pending >= batch_pages:
+                    flush()
+        flush()
+        for p in procs.values():
+            p.join()
+
+        main = configs[0] if configs else {}
+        total_events = conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+        dirty, dirty_high = load_dirty(conn)
+        with profiled(main.get("profile")):
+            post = post_ingest(conn, main, dirty, dirty_high, metrics)
+        modes = sorted({c.get("crawl_mode", "incremental") for c in configs})
+        result = pipeline_result(stats, ",".join(modes), total_events, post)
+        result["workers"] = len(procs)
+        return finish_run(conn, metrics, result, main)
+    finally:
+        for p in procs.values():
+            if p.is_alive():
+                p.terminate()
+        conn.close()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Run pipeline configs with feeds sharded over processes")
+    ap.add_argument("db_path")
+    ap.add_argument("configs", nargs="+", help="JSON pipeline config files")
+    ap.add_argument("--workers", type=int)
+    ap.add_argument("--batch-pages", type=int, default=16)
+    args = ap.parse_args()
+    configs = []
+    for path in args.configs:
+        with open(path) as f:
+            configs.append(json.load(f))
+    result = run_sharded(args.db_path, configs, workers=args.workers, batch_pages=args.batch_pages)
+    print(json.dumps(result, indent=2))
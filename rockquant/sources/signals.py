@@ -0,0 +1,139 @@
+import sqlite3
+
+from rockquant.db.connection import connect
+from rockquant.sources.registry import all_sources, default_source
+
+
+def _load_weights(conn: sqlite3.Connection, sources: list) -> list:
+    """Stage registry weights as temp tables; returns the (scope, type) pairs `sources` own.
+
+    Every registered source is staged so events are attributed to their own source
+    even when only some sources are being scored.
+    """
+    staged = {s.entity_id: s for s in all_sources()}
+    staged.update((s.entity_id, s) for s in sources)
+    selected = {s.entity_id for s in sources}
+    conn.execute("""CREATE TEMP TABLE IF NOT EXISTS _signal_sources (
+        entity_id TEXT PRIMARY KEY, scope TEXT, default_type TEXT, default_weight REAL,
+        selected INTEGER)""")
+    conn.execute("""CREATE TEMP TABLE IF NOT EXISTS _signal_weights (
+        entity_id TEXT, event_subtype TEXT, signal_type TEXT, weight REAL,
+        PRIMARY KEY (entity_id, event_subtype))""")
+    conn.execute("DELETE FROM _signal_sources")
+    conn.execute("DELETE FROM _signal_weights")
+    conn.executemany(
+        "INSERT INTO _signal_sources VALUES (?, ?, ?, ?, ?)",
+        [(s.entity_id, s.signal_scope, *(s.default_signal or (None, None)),
+          int(s.entity_id in selected)) for s in staged.values()],
+    )
+    conn.executemany(
+        "INSERT INTO _signal_weights VALUES (?, ?, ?, ?)",
+        [(s.entity_id, st, sig, w) for s in staged.values() for st, (sig, w) in s.signal_weights.items()],
+    )
+    owned = set()
+    for s in sources:
+        owned.update((s.signal_scope, sig) for sig, _ in s.signal_weights.values())
+        if s.default_signal:
+            owned.add((s.signal_scope, s.default_signal[0]))
+    return sorted(owned)
+
+
+def run_signal_engine(conn: sqlite3.Connection, dirty: set | None = None,
+                      sources: list | None = None) -> dict:
+    """Aggregate events into signals for every registered source in one pass.
+
+    Each event is scored by the source named in its source_entity_id (unknown or
+    missing ids use the default source). Buckets are summed per
+    (signal_date, signal_type, signal_scope) in SQL and written with one
+    set-based upsert; buckets owned by these sources that lost all their events
+    on a recomputed date are deleted.
+
+    `dirty` restricts the work to the dates of those (event_date, source) pairs;
+    None rebuilds everything. Does not commit.
+    """
+    sources = sources if sources is not None else all_sources()
+    dates = None if dirty is None else sorted({d for d, _ in dirty if d})
+    if not sources or dates == []:
+        return {"signals": 0, "deleted": 0, "dates": 0}
+
+    owned = _load_weights(conn, sources)
+    if dates is not None:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS _dirty_dates (d TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM _dirty_dates")
+        conn.executemany("INSERT OR IGNORE INTO _dirty_dates (d) VALUES (?)", [(d,) for d in dates])
+    date_filter = "" if dates is None else "AND e.event_date IN (SELECT d FROM _dirty_dates)"
+
+    conn.execute("DROP TABLE IF EXISTS _signal_agg")
+    conn.execute(f"""
+        CREATE TEMP TABLE _signal_agg AS
+        WITH ev AS (
+          SELECT e.id, e.event_date, e.event_subtype,
+                 COALESCE(src.entity_id, ?) AS entity_id
+          FROM events e
+          LEFT JOIN _signal_sources src ON src.entity_id = e.source_entity_id
+          WHERE e.event_date <> ''
+            AND e.event_subtype <> ''
+            {date_filter}
+        ),
+        scored AS (
+          SELECT ev.id, ev.event_date, s.scope,
+                 COALESCE(w.signal_type, s.default_type) AS signal_type,
+                 COALESCE(w.weight, s.default_weight) AS weight
+          FROM ev
+          JOIN _signal_sources s ON s.entity_id = ev.entity_id
+          LEFT JOIN _signal_weights w
+            ON w.entity_id = ev.entity_id AND w.event_subtype = ev.event_subtype
+          WHERE s.selected = 1
+            AND COALESCE(w.signal_type, s.default_type) IS NOT NULL
+          ORDER BY ev.event_date, ev.id
+        )
+        SELECT event_date AS signal_date, signal_type, scope AS signal_scope,
+               SUM(weight) AS score, COUNT(*) AS evidence_count,
+               json_group_array(id) AS supporting_event_ids
+        FROM scored
+        GROUP BY event_date, signal_type, scope
+    """, (default_source().entity_id,))
+    # Keeps the NOT EXISTS probe of the stale-bucket delete below a seek.
+    conn.execute("CREATE INDEX temp._signal_agg_key ON _signal_agg (signal_date, signal_type, signal_scope)")
+
+    cur = conn.execute("""
+        INSERT INTO signals (signal_date, signal_type, signal_scope, score, evidence_count, supporting_event_ids)
+        SELECT signal_date, signal_type, signal_scope, score, evidence_count, supporting_event_ids
+        FROM _signal_agg WHERE true
+        ON CONFLICT(signal_date, signal_type, signal_scope)
+        DO UPDATE SET
+            score = excluded.score,
+            evidence_count = excluded.evidence_count,
+            supporting_event_ids = excluded.supporting_event_ids,
+            created_at = datetime('now')
+    """)
+    upserted = cur.rowcount
+
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS _signal_owned (scope TEXT, type TEXT, PRIMARY KEY (scope, type))")
+    conn.execute("DELETE FROM _signal_owned")
+    conn.executemany("INSERT INTO _signal_owned VALUES (?, ?)", owned)
+    cur = conn.execute(f"""
+        DELETE FROM signals
+        WHERE (signal_scope, signal_type) IN (SELECT scope, type FROM _signal_owned)
+          {"" if dates is None else "AND signal_date IN (SELECT d FROM _dirty_dates)"}
+          AND NOT EXISTS (
+            SELECT 1 FROM _signal_agg a
+            WHERE a.signal_date = signals.signal_date
+              AND a.signal_type = signals.signal_type
+              AND a.signal_scope = signals.signal_scope)
+    """)
+    deleted = cur.rowcount
+    conn.execute("DROP TABLE _signal_agg")
+    return {"signals": upserted, "deleted": deleted,
+            "dates": len(dates) if dates is not None else None}
+
+
+def generate_source_signals(db_path: str, dirty: set | None = None,
+                            sources: list | None = None) -> dict:
+    conn = connect(db_path)
+    try:
+        result = run_signal_engine(conn, dirty=dirty, sources=sources)
+        conn.commit()
+        return result
+    finally:
+        conn.close()
@@ -0,0 +1,134 @@
+import argparse
+import json
+import sqlite3
+from datetime import date, timedelta
+
+import pandas as pd
+
+from rockquant.db.connection import connect
+from rockquant.db.migrate import migrate
+
+WINDOWS = (7, 30, 90)
+ZSCORE_WINDOW = 90
+# Days of history a recomputed date depends on: the z-score window over 7-day sums.
+LOOKBACK_DAYS = ZSCORE_WINDOW + WINDOWS[0]
+
+TREND_COLS = ("signal_scope", "signal_type", "signal_date", "score",
+              "sum_7d", "sum_30d", "sum_90d", "zscore_7d", "momentum")
+
+
+def _recompute_from(conn: sqlite3.Connection, since: str | None) -> str | None:
+    """Earliest signal_date whose trends may be stale, or None if nothing changed.
+
+    Trends after the last materialized date are always recomputed, as are dates
+    of signals written since the last run; `since` (e.g. the earliest dirty date
+    of a signal run) covers buckets that were deleted rather than rewritten.
+    """
+    # Two queries: each MAX() is then a single index seek.
+    last_date = conn.execute("SELECT MAX(signal_date) FROM signal_trends").fetchone()[0]
+    last_run = conn.execute("SELECT MAX(computed_at) FROM signal_trends").fetchone()[0]
+    if last_date is None:
+        return conn.execute("SELECT MIN(signal_date) FROM signals").fetchone()[0]
+    candidates = [c for c in (
+        since,
+        conn.execute("SELECT MIN(signal_date) FROM signals WHERE signal_date > ?", (last_date,)).fetchone()[0],
+        conn.execute("SELECT MIN(signal_date) FROM signals WHERE created_at >= ?", (last_run,)).fetchone()[0],
+    ) if c]
+    return min(candidates) if candidates else None
+
+
+def compute_trends(daily: pd.DataFrame, start: str, first_day: str) -> pd.DataFrame:
+    """Rolling sums, z-score and momentum for every series at once.
+
+    `daily` has signal_date, signal_type, signal_scope and score columns. Series
+    become columns of one calendar-day frame, so each window is a single
+    vectorized rolling() over all of them. The day grid starts at `first_day`
+    (the first signal date, or the start of the loaded history) so windows see
+    the same zero days however much history was loaded. Rows before `start`
+    only serve as history and are dropped from the result.
+    """
+    wide = daily.pivot_table(index="signal_date", columns=["signal_scope", "signal_type"],
+                             values="score", aggfunc="sum")
+    wide.index = pd.to_datetime(wide.index)
+    wide = wide.reindex(pd.date_range(first_day, wide.index.max(), freq="D"), fill_value=0.0)
+    wide = wide.fillna(0.0)
+
+    sums = {w: wide.rolling(w, min_periods=1).sum() for w in WINDOWS}
+    roll7 = sums[7].rolling(ZSCORE_WINDOW, min_periods=2)
+    z = (sums[7] - roll7.mean()) / roll7.std()
+    frames = {
+        "score": wide,
+        "sum_7d": sums[7],
+        "sum_30d": sums[30],
+        "sum_90d": sums[90],
+        "zscore_7d": z.where(z.abs() != float("inf")),
+        "momentum": sums[7] / 7 - sums[30] / 30,
+    }
+    out = pd.concat({k: v.stack(["signal_scope", "signal_type"], future_stack=True)
+                     for k, v in frames.items()}, axis=1)
+    out.index.names = ["signal_date", "signal_scope", "signal_type"]
+    out = out.reset_index()
+    out = out[(out["signal_date"] >= pd.Timestamp(start)) & (out["sum_90d"] != 0)]
+    out["signal_date"] = out["signal_date"].dt.strftime("%Y-%m-%d")
+    return out[list(TREND_COLS)]
+
+
+def update_trends(conn: sqlite3.Connection, since: str | None = None, full: bool = False) -> dict:
+    """Materialize rolling signal trends into signal_trends, incrementally.
+
+    Only dates from the first stale date on are recomputed (see _recompute_from),
+    reading LOOKBACK_DAYS of earlier signals as window history; `full` rebuilds
+    the whole table. Does not commit.
+    """
+    first_day = conn.execute("SELECT MIN(signal_date) FROM signals").fetchone()[0]
+    start = first_day if full else _recompute_from(conn, since)
+    if start is None:
+        if full:
+            conn.execute("DELETE FROM signal_trends")
+        return {"trend_rows": 0, "trends_from": None}
+
+    history = max(first_day or start, (date.fromisoformat(start) - timedelta(days=LOOKBACK_DAYS)).isoformat())
+    daily = pd.read_sql_query("""
+        SELECT signal_date, signal_type, signal_scope, score
+        FROM signals
+        WHERE signal_date >= ?
+    """, conn, params=(history,))
+
+    conn.execute("DELETE FROM signal_trends WHERE signal_date >= ?", (start,))
+    if daily.empty:
+        return {"trend_rows": 0, "trends_from": start}
+    rows = compute_trends(daily, start, history)
+    rows = rows.astype(object).where(rows.notna(), None)
+    conn.executemany(
+        f"INSERT INTO signal_trends ({', '.join(TREND_COLS)}) VALUES ({', '.join('?' * len(TREND_COLS))})",
+        rows.itertuples(index=False, name=None),
+    )
+    return {"trend_rows": len(rows), "trends_from": start}
+
+
+def load_trend(conn: sqlite3.Connection, signal_type: str, signal_scope: str = "global",
+               start: str | None = None, end: str | None = None) -> list:
+    """Trend rows of one series between start and end (inclusive), oldest first."""
+    cur = conn.execute(f"""
+        SELECT {', '.join(TREND_COLS[2:])}
+        FROM signal_trends
+        WHERE signal_scope = ? AND signal_type = ? AND signal_date BETWEEN ? AND ?
+        ORDER BY signal_date
+    """, (signal_scope, signal_type, start or "", end or "9999-12-31"))
+    cols = [d[0] for d in cur.description]
+    return [dict(zip(cols, r)) for r in cur.fetchall()]
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Update the signal_trends table")
+    ap.add_argument("db_path")
+    ap.add_argument("--full", action="store_true", help="rebuild all trends")
+    args = ap.parse_args()
+    migrate(args.db_path)
+    conn = connect(args.db_path)
+    try:
+        result = update_trends(conn, full=args.full)
+        conn.commit()
+    finally:
+        conn.close()
+    print(json.dumps(result, indent=2))